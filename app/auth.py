@@ -1,36 +1,57 @@
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+import uuid
 import jwt
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 
 from app.models.users import User as UserModel
-from app.config import SECRET_KEY, ALGORITHM
-from app.depends import get_async_db
+from app.config import SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, AUTH_STATELESS
+from app.depends import get_async_db, get_user_cache, get_token_denylist
+from app.services.passwords import PasswordHasher
+from app.services.refresh_tokens import store_refresh_token
+from app.services.token_denylist import TokenDenylist
+from app.services.user_cache import UserCache
 
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
 )
 
+# bcrypt runs in its own thread pool so it never blocks the event loop
+password_hasher = PasswordHasher(pwd_context, workers=PASSWORD_HASH_WORKERS)
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-def hash_password(password: str) -> str:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Authenticated caller as seen by endpoints that do not need the full user row
+    """
+    id: int
+    email: str
+    role: str
+
+
+async def hash_password(password: str) -> str:
     """
     Hashes a plain password using bcrypt
     """
 
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
 
 
-def verify_password(
+async def verify_password(
         plain_password: str,
         hashed_password: str
 ) -> bool:
@@ -38,7 +59,31 @@ def verify_password(
     Verifies a plain password against its hashed version
     """
 
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+        plain_password: str,
+        hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies a plain password and returns a new hash if the stored one uses an outdated cost factor
+    """
+
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+
+def token_claims(user: UserModel | Row) -> dict:
+    """
+    Claims identifying a user in access and refresh tokens
+    """
+
+    return {
+        "sub": user.email,
+        "role": user.role,
+        "id": user.id,
+        "ver": user.token_version,
+    }
 
 
 def create_access_token(data: dict) -> str:
@@ -55,12 +100,13 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def create_refresh_token(data: dict) -> str:
+def create_refresh_token(data: dict, expire: datetime | None = None) -> str:
     """
     Creates a JWT refresh token with expiration time
     """
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    if expire is None:
+        expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({
         "exp": expire,
         "token_type": "refresh",
@@ -68,12 +114,21 @@ def create_refresh_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        db: AsyncSession = Depends(get_async_db)
-) -> UserModel:
+async def issue_refresh_token(db: AsyncSession, user: UserModel | Row, parent: Row | None = None) -> str:
     """
-    Retrieves the current authenticated user based on JWT token
+    Creates a refresh token and records it in the refresh token store.
+    Pass the rotated token as `parent` to keep the new one in its family.
+    """
+
+    jti = uuid.uuid4()
+    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    await store_refresh_token(db, jti, user.id, expire, parent=parent)
+    return create_refresh_token({**token_claims(user), "jti": str(jti)}, expire)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Validates an access token and returns its claims
     """
 
     credentials_exception = HTTPException(
@@ -85,9 +140,9 @@ async def get_current_user(
         # Decode JWT token and validate signature
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        # Extract user identifier from token payload
+        # Extract user identifier from token payload; refresh tokens are not accepted here
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("token_type") != "access":
             raise credentials_exception
 
     # When token is valid but expired
@@ -101,17 +156,101 @@ async def get_current_user(
     except jwt.PyJWTError:
         raise credentials_exception
 
-    result = await db.scalars(
-        select(UserModel).where(UserModel.email == email, UserModel.is_active == True))
-    user = result.first()
+    return payload
+
 
+def decode_refresh_token(token: str) -> tuple[dict, uuid.UUID]:
+    """
+    Validates a refresh token and returns its claims and its id in the refresh token store
+    """
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Validate refresh JWT (signature, expiration, token type)
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("sub") is None or payload.get("token_type") != "refresh":
+            raise credentials_exception
+
+        # Tokens issued before the refresh token store have no "jti" and are not accepted
+        jti = uuid.UUID(payload["jti"])
+
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        raise credentials_exception
+
+    return payload, jti
+
+
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db),
+        user_cache: UserCache = Depends(get_user_cache),
+) -> UserModel:
+    """
+    Retrieves the current authenticated user based on JWT token.
+    Active users are cached by token subject, so most requests skip the users query.
+    """
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = decode_access_token(token)
+    email: str = payload["sub"]
+
+    user = user_cache.get(email)
     if user is None:
+        generation = user_cache.generation
+        result = await db.scalars(
+            select(UserModel).where(UserModel.email == email, UserModel.is_active == True))
+        user = result.first()
+
+        if user is None:
+            raise credentials_exception
+
+        user_cache.set(email, user, generation)
+
+    # Tokens issued before the last revocation
+    if payload.get("ver", 0) != user.token_version:
         raise credentials_exception
 
     return user
 
 
-def get_current_admin(current_user: UserModel = Depends(get_current_user)):
+async def get_current_principal(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db),
+        user_cache: UserCache = Depends(get_user_cache),
+        denylist: TokenDenylist = Depends(get_token_denylist),
+) -> Principal:
+    """
+    Retrieves the current authenticated caller.
+    In stateless mode it is taken from the verified token claims without touching the database;
+    revoked tokens are rejected through the in-memory denylist.
+    """
+
+    if not AUTH_STATELESS:
+        user = await get_current_user(token, db, user_cache)
+        return Principal(id=user.id, email=user.email, role=user.role)
+
+    payload = decode_access_token(token)
+    user_id, role = payload.get("id"), payload.get("role")
+    if user_id is None or role is None or denylist.is_revoked(user_id, payload.get("ver", 0)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return Principal(id=user_id, email=payload["sub"], role=role)
+
+
+def get_current_admin(current_user: Principal = Depends(get_current_principal)) -> Principal:
     """
     Retrieves the current admin user
     """
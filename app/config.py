@@ -4,4 +4,89 @@ from dotenv import load_dotenv
 
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = "HS256"
\ No newline at end of file
+ALGORITHM = "HS256"
+
+# Open Library API; point it at scripts/fake_open_library.py for offline benchmarks
+OPEN_LIBRARY_BASE_URL = os.getenv("OPEN_LIBRARY_BASE_URL", "https://openlibrary.org")
+
+# Open Library metadata cache
+OPEN_LIBRARY_CACHE_MAX_ENTRIES = int(os.getenv("OPEN_LIBRARY_CACHE_MAX_ENTRIES", "10000"))
+OPEN_LIBRARY_CACHE_PERSISTENT = os.getenv("OPEN_LIBRARY_CACHE_PERSISTENT", "true").lower() == "true"
+
+# Time to live (seconds) for each kind of cached Open Library entity
+OPEN_LIBRARY_CACHE_TTL = {
+    "work": int(os.getenv("OPEN_LIBRARY_CACHE_TTL_WORK", str(24 * 60 * 60))),
+    "edition": int(os.getenv("OPEN_LIBRARY_CACHE_TTL_EDITION", str(24 * 60 * 60))),
+    "author": int(os.getenv("OPEN_LIBRARY_CACHE_TTL_AUTHOR", str(7 * 24 * 60 * 60))),
+    "search": int(os.getenv("OPEN_LIBRARY_CACHE_TTL_SEARCH", str(10 * 60))),
+}
+
+# How long expired entries may still be served while Open Library is unavailable
+OPEN_LIBRARY_CACHE_STALE_TTL = int(os.getenv("OPEN_LIBRARY_CACHE_STALE_TTL", str(7 * 24 * 60 * 60)))
+
+# Circuit breaker for Open Library outages
+OPEN_LIBRARY_BREAKER_FAILURE_THRESHOLD = int(os.getenv("OPEN_LIBRARY_BREAKER_FAILURE_THRESHOLD", "5"))
+OPEN_LIBRARY_BREAKER_RESET_TIMEOUT = float(os.getenv("OPEN_LIBRARY_BREAKER_RESET_TIMEOUT", "30"))
+
+# Concurrent sub-requests (authors, works) made for a single book lookup
+OPEN_LIBRARY_FANOUT_CONCURRENCY = int(os.getenv("OPEN_LIBRARY_FANOUT_CONCURRENCY", "8"))
+OPEN_LIBRARY_FANOUT_DEADLINE = float(os.getenv("OPEN_LIBRARY_FANOUT_DEADLINE", "10"))
+
+# Global rate limit of Open Library requests (per second, 0 disables) and allowed burst
+OPEN_LIBRARY_RATE_LIMIT = float(os.getenv("OPEN_LIBRARY_RATE_LIMIT", "5"))
+OPEN_LIBRARY_RATE_BURST = int(os.getenv("OPEN_LIBRARY_RATE_BURST", "10"))
+
+# Number of works resolved by one batched search request
+OPEN_LIBRARY_BATCH_SIZE = int(os.getenv("OPEN_LIBRARY_BATCH_SIZE", "50"))
+
+# Outbound HTTP client (shared connection pool)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "false").lower() == "true"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+
+# Prefetch the next page of search results in the background
+OPEN_LIBRARY_SEARCH_PREFETCH = os.getenv("OPEN_LIBRARY_SEARCH_PREFETCH", "true").lower() == "true"
+
+# Answer work/edition/author lookups from the local catalog mirror before calling Open Library
+OPEN_LIBRARY_LOCAL_FIRST = os.getenv("OPEN_LIBRARY_LOCAL_FIRST", "false").lower() == "true"
+
+# Book search backend: "open_library" or "local" (books table full-text index)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "open_library")
+
+# Background enrichment of skeleton books rows
+ENRICHMENT_WORKERS = int(os.getenv("ENRICHMENT_WORKERS", "2"))
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "50"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "5"))
+ENRICHMENT_RETRY_DELAY = float(os.getenv("ENRICHMENT_RETRY_DELAY", "30"))
+ENRICHMENT_POLL_INTERVAL = float(os.getenv("ENRICHMENT_POLL_INTERVAL", "5"))
+ENRICHMENT_LEASE = float(os.getenv("ENRICHMENT_LEASE", "300"))
+
+# bcrypt cost factor (existing hashes are upgraded on login) and hashing threads
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+# Authenticate from access token claims without loading the user row, and how often (seconds)
+# the in-memory denylist of revoked tokens is reloaded
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+AUTH_DENYLIST_REFRESH_INTERVAL = float(os.getenv("AUTH_DENYLIST_REFRESH_INTERVAL", "10"))
+
+# Deletion of expired refresh tokens: seconds between sweeps and rows deleted per batch
+REFRESH_TOKEN_SWEEP_INTERVAL = float(os.getenv("REFRESH_TOKEN_SWEEP_INTERVAL", "3600"))
+REFRESH_TOKEN_SWEEP_BATCH_SIZE = int(os.getenv("REFRESH_TOKEN_SWEEP_BATCH_SIZE", "1000"))
+
+# Cache of authenticated users (seconds, 0 disables) and its size
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Cover image proxy (/covers/{cover_id}) with an on-disk cache
+COVER_CACHE_DIR = os.getenv("COVER_CACHE_DIR", "cover_cache")
+COVER_CACHE_MAX_BYTES = int(os.getenv("COVER_CACHE_MAX_MB", "512")) * 1024 * 1024
+COVER_THUMBNAIL_WORKERS = int(os.getenv("COVER_THUMBNAIL_WORKERS", "2"))
+
+# Return cover URLs of our own proxy instead of covers.openlibrary.org
+COVER_PROXY = os.getenv("COVER_PROXY", "false").lower() == "true"
+COVER_PROXY_BASE_URL = os.getenv("COVER_PROXY_BASE_URL", "/covers")
@@ -15,5 +15,13 @@ async_engine = create_async_engine(DATABASE_URL, echo=True)
 
 async_session_maker = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
 
+# Read-only sessions: autocommit connections (no BEGIN/COMMIT round trips) and no autoflush
+async_read_session_maker = async_sessionmaker(
+    async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
 class Base(DeclarativeBase):
     pass
@@ -1,6 +1,19 @@
 from collections.abc import AsyncGenerator
+
+from fastapi import Request, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import async_session_maker
+
+from app.database import async_session_maker, async_read_session_maker
+from app.services.http_client import InstrumentedTransport
+from app.services.open_library import OpenLibraryService
+from app.services.search import SearchBackend
+from app.services.enrichment import EnrichmentQueue
+from app.services.covers import CoverCache
+from app.services.books import BookRepository
+from app.services.user_cache import UserCache
+from app.services.token_denylist import TokenDenylist
+from app.services.refresh_tokens import RefreshTokenSweeper
+
 
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -8,3 +21,79 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only SQLAlchemy session for list endpoints.
+    Statements run in autocommit mode; nothing is flushed or committed.
+    """
+    async with async_read_session_maker() as session:
+        yield session
+
+
+def get_http_transport(request: Request) -> InstrumentedTransport:
+    """
+    Transport of the shared outbound HTTP client, with connection pool metrics
+    """
+    return request.app.state.http_transport
+
+
+def get_open_library_service(request: Request) -> OpenLibraryService:
+    """
+    Open Library service bound to the shared HTTP client
+    """
+    return request.app.state.open_library_service
+
+
+def get_search_backend(request: Request) -> SearchBackend:
+    """
+    Configured book search backend
+    """
+    return request.app.state.search_backend
+
+
+def get_enrichment_queue(request: Request) -> EnrichmentQueue:
+    """
+    Background queue that hydrates skeleton books rows
+    """
+    return request.app.state.enrichment_queue
+
+
+def get_cover_cache(request: Request) -> CoverCache:
+    """
+    On-disk cache of cover images
+    """
+    return request.app.state.cover_cache
+
+
+
+def get_user_cache(request: Request) -> UserCache:
+    """
+    Cache of authenticated user principals
+    """
+    return request.app.state.user_cache
+
+
+def get_token_denylist(request: Request) -> TokenDenylist:
+    """
+    Recently revoked tokens, checked by stateless authentication
+    """
+    return request.app.state.token_denylist
+
+
+def get_refresh_token_sweeper(request: Request) -> RefreshTokenSweeper:
+    """
+    Background deletion of expired refresh tokens
+    """
+    return request.app.state.refresh_token_sweeper
+
+
+def get_book_repository(
+        db: AsyncSession = Depends(get_async_db),
+        service: OpenLibraryService = Depends(get_open_library_service),
+) -> BookRepository:
+    """
+    Books table access bound to the request's database session
+    """
+    return BookRepository(db, service)
@@ -0,0 +1,55 @@
+"""add book rating stats
+
+Revision ID: a6d3f8b1c574
+Revises: f1c7a9e3b248
+Create Date: 2026-10-18 19:41:07.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f8b1c574'
+down_revision: Union[str, Sequence[str], None] = 'f1c7a9e3b248'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('book_rating_stats',
+    sa.Column('work_olid', sa.String(length=50), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Float(), nullable=False),
+    sa.Column('stars_1', sa.Integer(), nullable=False),
+    sa.Column('stars_2', sa.Integer(), nullable=False),
+    sa.Column('stars_3', sa.Integer(), nullable=False),
+    sa.Column('stars_4', sa.Integer(), nullable=False),
+    sa.Column('stars_5', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('work_olid')
+    )
+
+    # Backfill from existing reviews
+    op.execute("""
+        INSERT INTO book_rating_stats (work_olid, review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+        SELECT
+            work_olid,
+            count(*),
+            sum(rating),
+            count(*) FILTER (WHERE floor(rating) = 1),
+            count(*) FILTER (WHERE floor(rating) = 2),
+            count(*) FILTER (WHERE floor(rating) = 3),
+            count(*) FILTER (WHERE floor(rating) = 4),
+            count(*) FILTER (WHERE floor(rating) = 5)
+        FROM reviews
+        GROUP BY work_olid
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('book_rating_stats')
@@ -0,0 +1,28 @@
+"""add reviews rating index
+
+Revision ID: b3e5c7d9f146
+Revises: a6d3f8b1c574
+Create Date: 2026-10-18 20:06:52.904713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e5c7d9f146'
+down_revision: Union[str, Sequence[str], None] = 'a6d3f8b1c574'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reviews_work_olid_rating_id', 'reviews', ['work_olid', 'rating', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_work_olid_rating_id', table_name='reviews')
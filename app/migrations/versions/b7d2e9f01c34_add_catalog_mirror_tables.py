@@ -0,0 +1,38 @@
+"""add catalog mirror tables
+
+Revision ID: b7d2e9f01c34
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-18 13:47:05.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9f01c34'
+down_revision: Union[str, Sequence[str], None] = 'a3f1c2d4e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('catalog_works', 'catalog_editions', 'catalog_authors'):
+        op.create_table(table,
+        sa.Column('key', sa.String(length=50), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('last_modified', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_authors')
+    op.drop_table('catalog_editions')
+    op.drop_table('catalog_works')
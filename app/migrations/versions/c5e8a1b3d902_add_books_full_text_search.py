@@ -0,0 +1,45 @@
+"""add books full text search
+
+Revision ID: c5e8a1b3d902
+Revises: b7d2e9f01c34
+Create Date: 2026-10-18 15:02:33.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a1b3d902'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e9f01c34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('subjects', sa.Text(), nullable=True))
+    op.add_column('books', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(authors, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(subjects, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_books_search_vector', 'books', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(op.f('ix_books_published_year'), 'books', ['published_year'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_books_published_year'), table_name='books')
+    op.drop_index('ix_books_search_vector', table_name='books', postgresql_using='gin')
+    op.drop_column('books', 'search_vector')
+    op.drop_column('books', 'subjects')
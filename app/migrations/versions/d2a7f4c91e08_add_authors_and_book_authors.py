@@ -0,0 +1,69 @@
+"""add authors and book_authors
+
+Revision ID: d2a7f4c91e08
+Revises: c5e8a1b3d902
+Create Date: 2026-10-18 16:11:47.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c91e08'
+down_revision: Union[str, Sequence[str], None] = 'c5e8a1b3d902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(authors, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(subjects, '')), 'C')"
+)
+
+
+def _alter_authors_type(type_) -> None:
+    # A column used by a generated column cannot change type, so rebuild search_vector around it
+    op.drop_index('ix_books_search_vector', table_name='books', postgresql_using='gin')
+    op.drop_column('books', 'search_vector')
+    op.alter_column('books', 'authors', type_=type_, existing_nullable=True)
+    op.add_column('books', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_books_search_vector', 'books', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('authors',
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_table('book_authors',
+    sa.Column('work_olid', sa.String(length=50), nullable=False),
+    sa.Column('author_key', sa.String(length=50), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_key'], ['authors.key'], ),
+    sa.ForeignKeyConstraint(['work_olid'], ['books.work_olid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('work_olid', 'author_key')
+    )
+    op.create_index(op.f('ix_book_authors_author_key'), 'book_authors', ['author_key'], unique=False)
+    _alter_authors_type(sa.Text())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE books SET authors = left(authors, 255)")
+    _alter_authors_type(sa.String(length=255))
+    op.drop_index(op.f('ix_book_authors_author_key'), table_name='book_authors')
+    op.drop_table('book_authors')
+    op.drop_table('authors')
@@ -0,0 +1,41 @@
+"""add enrichment queue
+
+Revision ID: e4b9c6d2a715
+Revises: d2a7f4c91e08
+Create Date: 2026-10-18 17:24:09.512877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c6d2a715'
+down_revision: Union[str, Sequence[str], None] = 'd2a7f4c91e08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('enrichment_queue',
+    sa.Column('work_olid', sa.String(length=50), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('enqueued_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('failed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('work_olid')
+    )
+    op.create_index(op.f('ix_enrichment_queue_next_attempt_at'), 'enrichment_queue', ['next_attempt_at'], unique=False)
+    op.alter_column('books', 'title', existing_type=sa.String(length=255), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE books SET title = '' WHERE title IS NULL")
+    op.alter_column('books', 'title', existing_type=sa.String(length=255), nullable=False)
+    op.drop_index(op.f('ix_enrichment_queue_next_attempt_at'), table_name='enrichment_queue')
+    op.drop_table('enrichment_queue')
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: f1c7a9e3b248
+Revises: e4b9c6d2a715
+Create Date: 2026-10-18 19:02:41.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a9e3b248'
+down_revision: Union[str, Sequence[str], None] = 'e4b9c6d2a715'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_favorites_user_id_created_at_id', 'favorites', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_user_books_user_id_created_at_id', 'user_books', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_work_olid_created_at_id', 'reviews', ['work_olid', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_reviews_work_olid_created_at_id', table_name='reviews')
+    op.drop_index('ix_user_books_user_id_created_at_id', table_name='user_books')
+    op.drop_index('ix_favorites_user_id_created_at_id', table_name='favorites')
@@ -6,5 +6,15 @@ from .bookshelves import BookShelf
 from .books_in_shelf import BookInShelf
 from .user_books import UserBook
 from .books import Book
+from .open_library_cache import OpenLibraryCacheEntry
+from .catalog import CatalogWork, CatalogEdition, CatalogAuthor
+from .authors import Author
+from .book_authors import BookAuthor
+from .enrichment_tasks import EnrichmentTask
+from .book_rating_stats import BookRatingStats
+from .token_revocations import TokenRevocation
+from .refresh_tokens import RefreshToken
 
-__all__ = ["Favorite", "User", "Review", "BookShelf", "BookInShelf", "UserBook", "Book"]
\ No newline at end of file
+__all__ = ["Favorite", "User", "Review", "BookShelf", "BookInShelf", "UserBook", "Book", "OpenLibraryCacheEntry",
+           "CatalogWork", "CatalogEdition", "CatalogAuthor", "Author", "BookAuthor",
+           "EnrichmentTask", "BookRatingStats", "TokenRevocation", "RefreshToken"]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import String, Text, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class Author(Base):
+    """
+    Author names resolved from Open Library, keyed by author OLID.
+    """
+    __tablename__ = "authors"
+
+    # Fields
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
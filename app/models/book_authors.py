@@ -0,0 +1,25 @@
+from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class BookAuthor(Base):
+    """
+    Links a book to its authors in Open Library order.
+    """
+    __tablename__ = "book_authors"
+
+    # Fields
+    work_olid: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("books.work_olid", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    author_key: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("authors.key"),
+        primary_key=True,
+        index=True,
+    )
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,29 @@
+from sqlalchemy import Integer, String, Float, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class BookRatingStats(Base):
+    """
+    Review aggregates of a book, maintained together with its reviews.
+    """
+    __tablename__ = "book_rating_stats"
+
+    # Fields
+    work_olid: Mapped[str] = mapped_column(String(50), primary_key=True)
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    # Histogram by whole stars: a 4.5 rating counts as 4 stars
+    stars_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stars_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stars_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stars_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stars_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
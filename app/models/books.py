@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String
+from sqlalchemy import Integer, String, Text, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -10,6 +11,10 @@ if TYPE_CHECKING:
     from app.models.favorites import Favorite
 
 
+# Number of Open Library subjects kept per book for local search
+MAX_STORED_SUBJECTS = 20
+
+
 class Book(Base):
     """
     Book table represents books fetched from OpenLibrary
@@ -20,14 +25,34 @@ class Book(Base):
     # Fields
     id: Mapped[int] = mapped_column(primary_key=True)
     work_olid: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
-    title: Mapped[str] = mapped_column(String(255), nullable=False)
-    authors: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # NULL for skeleton rows waiting for background enrichment
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Comma-joined author names kept for full-text search; author lists are read from book_authors
+    authors: Mapped[str | None] = mapped_column(Text, nullable=True)
+    subjects: Mapped[str | None] = mapped_column(Text, nullable=True)
     cover_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    published_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    published_year: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+
+    # Full-text search document: title (A), authors (B), subjects (C)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(authors, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(subjects, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Relationships
     favorites: Mapped[list["Favorite"]] = relationship(
         "Favorite",
         back_populates="book",
         cascade="all, delete-orphan"
-    )
\ No newline at end of file
+    )
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
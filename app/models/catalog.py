@@ -0,0 +1,46 @@
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class CatalogWork(Base):
+    """
+    Open Library work record imported from the bulk dumps.
+    """
+    __tablename__ = "catalog_works"
+
+    # Fields
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_modified: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+
+class CatalogEdition(Base):
+    """
+    Open Library edition record imported from the bulk dumps.
+    """
+    __tablename__ = "catalog_editions"
+
+    # Fields
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_modified: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+
+class CatalogAuthor(Base):
+    """
+    Open Library author record imported from the bulk dumps.
+    """
+    __tablename__ = "catalog_authors"
+
+    # Fields
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_modified: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Integer, String, Text, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class EnrichmentTask(Base):
+    """
+    Pending metadata enrichment of a skeleton `books` row.
+    Rows are deleted once the book has been hydrated from Open Library.
+    """
+    __tablename__ = "enrichment_queue"
+
+    # Fields
+    work_olid: Mapped[str] = mapped_column(String(50), primary_key=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+    # Set when the task ran out of attempts
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, DateTime, func, UniqueConstraint, ForeignKey
+from sqlalchemy import Integer, String, DateTime, func, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -36,4 +36,6 @@ class Favorite(Base):
 
     __table_args__ = (
         UniqueConstraint("work_olid", "user_id", name="uq_favorite_work_user"),
+        # Keyset pagination of a user's favorites
+        Index("ix_favorites_user_id_created_at_id", "user_id", "created_at", "id"),
     )
\ No newline at end of file
@@ -0,0 +1,26 @@
+from sqlalchemy import String, DateTime, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class OpenLibraryCacheEntry(Base):
+    """
+    Persistent tier of the Open Library metadata cache.
+    Survives application restarts.
+    """
+    __tablename__ = "open_library_cache"
+
+    # Fields
+    key: Mapped[str] = mapped_column(String(1000), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import Integer, DateTime, Uuid, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+import uuid
+from datetime import datetime
+
+
+class RefreshToken(Base):
+    """
+    Issued refresh token. Tokens rotated from the same login share a family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    # Fields
+    # JWT "jti" claim; looked up by primary key on every refresh
+    jti: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
+    family_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False, index=True)
+    parent_jti: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Set when the token is exchanged for a new one; presenting it again is reuse
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # Foreign key
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, DateTime, Float, ForeignKey, func, UniqueConstraint, CheckConstraint
+from sqlalchemy import Integer, String, Text, DateTime, Float, ForeignKey, func, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -35,4 +35,7 @@ class Review(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "work_olid", name="uq_user_work_review"),
         CheckConstraint("rating >= 1 AND rating <= 5", name="ck_review_rating"),
+        # Keyset pagination of a book's reviews by date and by rating
+        Index("ix_reviews_work_olid_created_at_id", "work_olid", "created_at", "id"),
+        Index("ix_reviews_work_olid_rating_id", "work_olid", "rating", "id"),
     )
@@ -0,0 +1,24 @@
+from sqlalchemy import Integer, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from datetime import datetime
+
+
+class TokenRevocation(Base):
+    """
+    Lowest token version still accepted for a user whose tokens were recently revoked.
+    """
+    __tablename__ = "token_revocations"
+
+    # Fields
+    # No foreign key: revocations of deleted users must outlive the users row
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, DateTime, Enum, ForeignKey, func, UniqueConstraint, CheckConstraint
+from sqlalchemy import Integer, String, DateTime, Enum, ForeignKey, func, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 import enum
@@ -70,4 +70,6 @@ class UserBook(Base):
             "rating IS NULL OR (rating >= 1 AND rating <= 5)",
             name="check_rating_range",
         ),
+        # Keyset pagination of a user's reading list
+        Index("ix_user_books_user_id_created_at_id", "user_id", "created_at", "id"),
     )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Boolean, DateTime, func
+from sqlalchemy import Integer, String, Boolean, DateTime, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -27,6 +27,8 @@ class User(Base):
     username: Mapped[str] = mapped_column(String(25), nullable=False)
     role: Mapped[str] = mapped_column(String(20), default='user')
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Issued in token claims; bumping it revokes every token issued before
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # relationship
@@ -41,4 +43,10 @@ class User(Base):
     )
     user_books: Mapped[list["UserBook"]] = relationship(
         "UserBook", back_populates="user", cascade="all, delete-orphan"
+    )
+
+    # Indexes
+    __table_args__ = (
+        # Keyset pagination of the admin user list
+        Index("ix_users_created_at_id", "created_at", "id"),
     )
\ No newline at end of file
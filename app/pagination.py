@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+# Response header carrying the next cursor of endpoints that return plain lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """
+    Keyset (cursor) pagination over an ordered, unique-together list of columns.
+
+    - The cursor is an opaque token with the sort key of the last row of a page
+    - Pages are read with a row comparison `(a, b) < (:a, :b)`, so reading
+      page N costs the same as reading page 1 when a matching index exists
+    - Without a cursor, `page` falls back to LIMIT/OFFSET for compatibility
+    """
+
+    def __init__(self, *columns: InstrumentedAttribute, descending: bool = True):
+        self.columns = columns
+        self.descending = descending
+
+    def encode(self, item: Any) -> str:
+        values = []
+        for column in self.columns:
+            value = getattr(item, column.key)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(payload)
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError
+
+            decoded = []
+            for column, value in zip(self.columns, values):
+                python_type = column.type.python_type
+                if python_type is datetime:
+                    decoded.append(datetime.fromisoformat(value))
+                else:
+                    decoded.append(python_type(value))
+            return decoded
+        except (ValueError, TypeError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    def apply(self, query: Select, cursor: str | None, page: int, page_size: int) -> Select:
+        """
+        Orders the query by the keyset and selects one page (plus one row to detect the next page)
+        """
+
+        order = [column.desc() if self.descending else column.asc() for column in self.columns]
+        query = query.order_by(*order).limit(page_size + 1)
+
+        if cursor is None:
+            return query.offset((page - 1) * page_size)
+
+        values = self.decode(cursor)
+        key = tuple_(*self.columns)
+        bound = tuple_(*[literal(value, column.type) for column, value in zip(self.columns, values)])
+        return query.where(key < bound if self.descending else key > bound)
+
+    def trim(
+            self,
+            rows: Sequence,
+            page_size: int,
+            item: Callable[[Any], Any] = lambda row: row,
+    ) -> tuple[list, str | None]:
+        """
+        Drops the lookahead row and returns the page with the cursor of the next one.
+        `item` picks the mapped object holding the keyset columns out of a result row.
+        """
+
+        rows = list(rows)
+        if len(rows) <= page_size:
+            return rows, None
+
+        rows = rows[:page_size]
+        return rows, self.encode(item(rows[-1]))
@@ -0,0 +1,181 @@
+from fastapi import APIRouter, Query, HTTPException, status, Depends
+
+from app.auth import Principal, get_current_admin, password_hasher
+from app.depends import (
+    get_http_transport,
+    get_open_library_service,
+    get_enrichment_queue,
+    get_cover_cache,
+    get_user_cache,
+    get_token_denylist,
+    get_refresh_token_sweeper,
+)
+from app.services.covers import CoverCache
+from app.services.enrichment import EnrichmentQueue
+from app.services.http_client import InstrumentedTransport
+from app.services.open_library import OpenLibraryService
+from app.services.refresh_tokens import RefreshTokenSweeper
+from app.services.token_denylist import TokenDenylist
+from app.services.user_cache import UserCache
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+
+@router.get("/cache", summary="Get Open Library cache statistics")
+async def get_cache_stats(
+        service: OpenLibraryService = Depends(get_open_library_service),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns hit/miss counters of the Open Library metadata cache.
+
+    - Only accessible to admins
+    """
+    cache = service.cache
+
+    if cache is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cache is disabled")
+
+    return cache.stats()
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT, summary="Invalidate a cached Open Library entry")
+async def invalidate_cache_entry(
+        service: OpenLibraryService = Depends(get_open_library_service),
+        key: str = Query(..., description="Cache key, e.g. /works/OL45804W.json"),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Removes a single entry from both cache tiers.
+
+    - Only accessible to admins
+    """
+    cache = service.cache
+
+    if cache is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cache is disabled")
+
+    await cache.invalidate(key)
+
+    return None
+
+
+@router.get("/http-client", summary="Get outbound HTTP client pool metrics")
+async def get_http_client_metrics(
+        transport: InstrumentedTransport = Depends(get_http_transport),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns connection pool checkout metrics of the shared outbound HTTP client.
+
+    - Only accessible to admins
+    """
+    return transport.metrics.as_dict()
+
+
+@router.get("/open-library", summary="Get Open Library client status")
+async def get_open_library_status(
+        service: OpenLibraryService = Depends(get_open_library_service),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns the circuit breaker state, request scheduler queue waits per priority class,
+    request coalescing, catalog mirror and authors table counters.
+
+    - Only accessible to admins
+    """
+
+    return {
+        "circuit_breaker": service.breaker.as_dict(),
+        "scheduler": service.scheduler.as_dict(),
+        "coalesced_requests": service.coalesced_requests,
+        "catalog_mirror": service.mirror.stats() if service.mirror is not None else None,
+        "authors": service.authors.stats() if service.authors is not None else None,
+    }
+
+
+@router.get("/enrichment", summary="Get background enrichment queue status")
+async def get_enrichment_status(
+        queue: EnrichmentQueue = Depends(get_enrichment_queue),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns the depth of the enrichment queue, the age of the oldest pending task and worker counters.
+
+    - Only accessible to admins
+    """
+
+    return await queue.stats()
+
+
+@router.get("/covers", summary="Get cover cache statistics")
+async def get_cover_cache_stats(
+        covers: CoverCache = Depends(get_cover_cache),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns size and hit/miss counters of the on-disk cover cache.
+
+    - Only accessible to admins
+    """
+
+    return covers.stats()
+
+
+@router.get("/user-cache", summary="Get authenticated user cache statistics")
+async def get_user_cache_stats(
+        user_cache: UserCache = Depends(get_user_cache),
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns size, hit/miss and invalidation counters of the authenticated user cache.
+
+    - Only accessible to admins
+    """
+
+    return user_cache.stats()
+
+
+@router.get("/password-hashing", summary="Get password hashing pool statistics")
+async def get_password_hashing_stats(
+        admin: Principal = Depends(get_current_admin),
+):
+    """
+    Returns queue wait and hashing time of the bcrypt thread pool and the number of upgraded hashes.
+
+    - Only accessible to admins
+    """
+
+    return password_hasher.stats()
+
+
+@router.get("/token-denylist", summary="Get token denylist statistics")
+async def get_token_denylist_stats(
+        admin: Principal = Depends(get_current_admin),
+        denylist: TokenDenylist = Depends(get_token_denylist),
+):
+    """
+    Returns the size and refresh statistics of the in-memory denylist used by stateless authentication.
+
+    - Only accessible to admins
+    """
+
+    return denylist.stats()
+
+
+@router.get("/refresh-tokens", summary="Get refresh token sweep statistics")
+async def get_refresh_token_stats(
+        admin: Principal = Depends(get_current_admin),
+        sweeper: RefreshTokenSweeper = Depends(get_refresh_token_sweeper),
+):
+    """
+    Returns how many expired refresh tokens the background sweep has deleted.
+
+    - Only accessible to admins
+    """
+
+    return sweeper.stats()
@@ -1,16 +1,33 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
-import jwt
 
 from app.models.users import User as UserModel
 from app.schemas.auth import RefreshTokenRequest
-from app.depends import get_async_db
-from app.auth import verify_password, create_access_token, create_refresh_token
-from app.config import SECRET_KEY, ALGORITHM
+from app.depends import get_async_db, get_user_cache, get_token_denylist
+from app.auth import (
+    verify_and_update_password,
+    create_access_token,
+    issue_refresh_token,
+    decode_refresh_token,
+    token_claims,
+    get_current_user,
+)
+from app.services.refresh_tokens import (
+    rotate_refresh_token,
+    revoke_reused_family,
+    revoke_family,
+    revoke_user_refresh_tokens,
+)
+from app.services.token_denylist import TokenDenylist, revoke_user_tokens
+from app.services.user_cache import UserCache, publish_user_change
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",
     tags=["auth"],
@@ -30,25 +47,25 @@ async def login(
         select(UserModel).where(UserModel.email == form_data.username, UserModel.is_active == True))
     user = result.first()
 
-    if not user or not verify_password(form_data.password, str(user.hashed_password)):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password(form_data.password, str(user.hashed_password))
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "role": user.role,
-            "id": user.id}
-    )
+    # Upgrade the stored hash after the configured bcrypt cost changed; committed with the refresh token
+    if new_hash is not None:
+        user.hashed_password = new_hash
+
+    access_token = create_access_token(data=token_claims(user))
 
-    refresh_token = create_refresh_token(
-        data={
-            "sub": user.email,
-            "role": user.role,
-            "id": user.id})
+    refresh_token = await issue_refresh_token(db, user)
+    await db.commit()
 
     return {
         "access_token": access_token,
@@ -64,6 +81,9 @@ async def refresh_token(
 ):
     """
     Send a refresh token to obtain a new JWT access token and refresh token.
+
+    - Every refresh token can be used once; it is replaced by the returned one
+    - Presenting a used refresh token again revokes all tokens descending from the same login
     """
 
     credentials_exception = HTTPException(
@@ -72,41 +92,63 @@ async def refresh_token(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    old_refresh_token = body.refresh_token
-
-    # Validate refresh JWT (signature, expiration, token type)
-    try:
-        payload = jwt.decode(old_refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str | None = payload.get("sub")
-        token_type: str | None = payload.get("token_type")
+    payload, jti = decode_refresh_token(body.refresh_token)
 
-        if email is None or token_type != "refresh":
-            raise credentials_exception
-
-    except jwt.ExpiredSignatureError:
-        raise credentials_exception
-
-    except jwt.PyJWTError:
+    rotated = await rotate_refresh_token(db, jti)
+    if rotated is None:
+        if await revoke_reused_family(db, jti):
+            logger.warning("Refresh token reuse detected, token family of %s revoked", payload["sub"])
+            await db.commit()
         raise credentials_exception
 
-    result = await db.scalars(
-        select(UserModel).where(
-            UserModel.email == email,
-            UserModel.is_active == True
-        )
-    )
-    user = result.first()
-    if user is None:
+    # Refresh tokens issued before the last revocation are rejected as well
+    if payload.get("ver", 0) != rotated.token_version:
         raise credentials_exception
 
-    new_refresh_token = create_refresh_token(
-        data={
-            "sub": user.email,
-            "role": user.role,
-            "id": user.id}
-    )
+    access_token = create_access_token(data=token_claims(rotated))
+    new_refresh_token = await issue_refresh_token(db, rotated, parent=rotated)
+    await db.commit()
 
     return {
+        "access_token": access_token,
         "refresh_token": new_refresh_token,
         "token_type": "bearer",
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, summary="Log out")
+async def logout(
+    body: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Revoke a refresh token and every token rotated from the same login.
+    Access tokens already issued stay valid until they expire.
+    """
+
+    _, jti = decode_refresh_token(body.refresh_token)
+    await revoke_family(db, jti)
+    await db.commit()
+    return None
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT, summary="Log out from all devices")
+async def logout_all(
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user_cache: UserCache = Depends(get_user_cache),
+    denylist: TokenDenylist = Depends(get_token_denylist),
+):
+    """
+    Revoke every access and refresh token issued to the current user, including the one used for this request.
+    """
+
+    user = await db.get(UserModel, current_user.id)
+    user.token_version += 1
+    await revoke_user_tokens(db, user.id, user.token_version)
+    await revoke_user_refresh_tokens(db, user.id)
+    await publish_user_change(db, user.email)
+    await db.commit()
+    user_cache.invalidate(user.email)
+    denylist.revoke(user.id, user.token_version)
+    return None
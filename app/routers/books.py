@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Request, Query, HTTPException, status, Depends
+from fastapi import APIRouter, Query, HTTPException, status, Depends
+from typing import Literal
 
 from app.schemas.books import Book as BookSchema, BooksSearchItem, BooksSearchList
 from app.schemas.reviews import Review as ReviewSchema, ReviewCreate, ReviewList
 from app.models.reviews import Review as ReviewModel
 from app.models.users import User as UserModel
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.depends import get_async_db
+from app.depends import get_async_db, get_open_library_service, get_search_backend
+from app.services.open_library import OpenLibraryService
+from app.services.search import SearchBackend
 
 from app.auth import get_current_user
+from app.pagination import Keyset
+from app.services.ratings import apply_rating_change, get_rating_summary
 
 
 
@@ -18,10 +23,17 @@ router = APIRouter(
     tags=["books"],
 )
 
+# Review list orders; each is backed by a (work_olid, <sort key>, id) index
+REVIEW_SORTS = {
+    "newest": Keyset(ReviewModel.created_at, ReviewModel.id),
+    "highest": Keyset(ReviewModel.rating, ReviewModel.id),
+    "lowest": Keyset(ReviewModel.rating, ReviewModel.id, descending=False),
+}
+
 
 @router.get("/search", response_model=BooksSearchList, summary="Search books with filters")
 async def search_books(
-    request: Request,
+    backend: SearchBackend = Depends(get_search_backend),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     title: str | None = Query(None, description="Book title"),
@@ -36,60 +48,26 @@ async def search_books(
 
     - You can filter by **title**, **author**, **year**, **subject**, **ISBN**, or **publisher**
     - Pagination is controlled via `page` and `page_size`
+    - Results come from the configured search backend (Open Library or the local books index)
     """
-    service = request.app.state.open_library_service
-
-    # Build search query parts from provided filters
-    q_parts = []
-    if title:
-        q_parts.append(f'title:"{title}"')
-    if authors:
-        q_parts.append(f'author:"{authors}"')
-    if year:
-        q_parts.append(f'first_publish_year:{year}')
-    if subject:
-        q_parts.append(f'subject:"{subject}"')
-    if isbn:
-        q_parts.append(f'isbn:{isbn}')
-    if publisher:
-        q_parts.append(f'publisher:"{publisher}"')
+    filters = {
+        "title": title,
+        "authors": authors,
+        "year": year,
+        "subject": subject,
+        "isbn": isbn,
+        "publisher": publisher,
+    }
 
     # Return empty result if no filters are provided
-    if not q_parts:
+    if not any(filters.values()):
         return BooksSearchList(items=[], total=0, page=page, page_size=page_size)
 
-    # Combine query parts and calculate pagination offset
-    q = " AND ".join(q_parts)
-    offset = (page - 1) * page_size
-
-    results = await service.search_books(query=q, offset=offset, limit=page_size)
-
-    items = []
-    for doc in results.get("docs", []):
-        # Normalize authors list
-        authors_list = []
-        for a in doc.get("author_name", []):
-            if isinstance(a, str):
-                authors_list.append(a)
-            elif isinstance(a, dict) and "name" in a:
-                authors_list.append(a["name"])
-
-        # Build cover image URL if available
-        cover_url = f"https://covers.openlibrary.org/b/id/{doc['cover_i']}-M.jpg" if doc.get("cover_i") else None
-
-        items.append(
-            BooksSearchItem(
-                work_olid=doc.get("key", "").split("/")[-1],
-                title=doc.get("title"),
-                authors=authors_list or None,
-                year=doc.get("first_publish_year"),
-                cover_url=cover_url,
-            )
-        )
+    results = await backend.search(filters, page=page, page_size=page_size)
 
     return BooksSearchList(
-        items=items,
-        total=results.get("numFound", 0),
+        items=[BooksSearchItem(**item) for item in results["items"]],
+        total=results["total"],
         page=page,
         page_size=page_size,
     )
@@ -98,7 +76,7 @@ async def search_books(
 @router.get("/{edition_olid}", response_model=BookSchema, summary="Get detailed book information by edition OLID")
 async def get_book_by_edition(
         edition_id: str,
-        request: Request
+        service: OpenLibraryService = Depends(get_open_library_service),
 ):
     """
     Retrieve detailed information for a specific book edition.
@@ -106,7 +84,6 @@ async def get_book_by_edition(
     - `edition_olid` should be the Open Library Edition OLID
     - Returns full details including title, authors, description, year, ISBN, pages, subjects, languages, publisher, and cover URL
     """
-    service = request.app.state.open_library_service
     book_data = await service.get_book_by_edition(edition_id)
 
     if not book_data:
@@ -121,7 +98,7 @@ async def create_review(
         review: ReviewCreate,
         db: AsyncSession = Depends(get_async_db),
         current_user: UserModel = Depends(get_current_user),
-        request: Request = None,
+        service: OpenLibraryService = Depends(get_open_library_service),
 ):
     """
     Create a new review for a book identified by its Work OLID.
@@ -132,7 +109,6 @@ async def create_review(
     - Returns the created review with rating and comment
     """
 
-    service = request.app.state.open_library_service
     book_data = await service.get_book_by_work(work_olid)
 
     if not book_data:
@@ -160,44 +136,61 @@ async def create_review(
     )
 
     db.add(new_review)
+    await apply_rating_change(db, work_olid, new=review.rating)
     await db.commit()
     await db.refresh(new_review)
 
-    return new_review
+    return ReviewSchema.model_validate(new_review).model_copy(update={"username": current_user.username})
 
 
 @router.get("/{work_olid}/reviews", response_model=ReviewList, summary="Get reviews for a book")
 async def get_review_list(
         work_olid: str,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=100),
+        sort: Literal["newest", "highest", "lowest"] = Query("newest", description="Review order"),
+        cursor: str | None = Query(None, description="`next_cursor` of the previous page; overrides `page`"),
         db: AsyncSession = Depends(get_async_db),
-        request: Request = None,
+        service: OpenLibraryService = Depends(get_open_library_service),
 ):
     """
-    Retrieve a list of reviews for a specific book identified by Work OLID.
+    Retrieve a paginated list of reviews for a specific book identified by Work OLID.
+
+    - `sort`: newest first, highest rating first or lowest rating first (ties by review ID)
+    - Pass `next_cursor` back as `cursor` (with the same `sort`) to read the next page
+    - `page` (offset mode) is kept for compatibility
+    - `avg_rating`, `review_count` and `rating_histogram` cover all reviews of the book
+      and are read from the precomputed book_rating_stats row
     """
 
-    service = request.app.state.open_library_service
-    book_data = await service.get_book_by_work(work_olid)
+    summary = await get_rating_summary(db, work_olid)
 
-    if not book_data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    # A book with reviews is known to exist; only unreviewed ones are checked against Open Library
+    if not summary["review_count"]:
+        book_data = await service.get_book_by_work(work_olid)
+
+        if not book_data:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
 
+    # Reviewer names come from the same query
+    keyset = REVIEW_SORTS[sort]
     result = await db.execute(
-        select(ReviewModel)
-        .where(ReviewModel.work_olid == work_olid)
-    )
-    reviews = result.scalars().all()
-
-    if not reviews:
-        avg_rating = None
-    else:
-        avg_rating = await db.scalar(
-            select(func.avg(ReviewModel.rating))
-            .where(ReviewModel.work_olid == work_olid)
+        keyset.apply(
+            select(ReviewModel, UserModel.username)
+            .join(UserModel, UserModel.id == ReviewModel.user_id)
+            .where(ReviewModel.work_olid == work_olid),
+            cursor, page, page_size,
         )
-        avg_rating = round(float(avg_rating), 2)
+    )
+    rows, next_cursor = keyset.trim(result.all(), page_size, item=lambda row: row[0])
 
     return ReviewList(
-        avg_rating=avg_rating,
-        reviews=reviews
+        avg_rating=summary["avg_rating"],
+        review_count=summary["review_count"],
+        rating_histogram=summary["histogram"],
+        reviews=[
+            ReviewSchema.model_validate(review).model_copy(update={"username": username})
+            for review, username in rows
+        ],
+        next_cursor=next_cursor,
     )
\ No newline at end of file
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.depends import get_async_db
+from app.depends import get_async_db, get_read_db, get_enrichment_queue, get_book_repository
+from app.services.enrichment import EnrichmentQueue
+from app.services.open_library import WORK_OLID_RE
+from app.services.books import BookRepository
+from app.services.scheduler import BULK
 from app.models.bookshelves import BookShelf as BookShelfModel
 from app.models.books_in_shelf import BookInShelf as BookInShelfModel
-from app.models.users import User as UserModel
-from app.models.books import Book as BookModel
+from app.services.authors import get_book_authors
 
 from app.schemas.bookshelves import BookShelf as BookShelfSchema, BookShelfCreate, BookShelfList, BookShelfUpdate
 from app.schemas.books_in_shelf import BookInShelf as BookInShelfSchema, BookAdd
-from app.auth import get_current_user
+from app.schemas.bulk import BulkWorks, BulkResult
+from app.auth import Principal, get_current_principal
 
 
 router = APIRouter(
@@ -24,7 +29,7 @@ router = APIRouter(
 async def create_bookshelf(
         bookshelf_data: BookShelfCreate,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Create a new bookshelf for the current user.
@@ -70,44 +75,41 @@ async def create_bookshelf(
 
 @router.get("/", response_model=list[BookShelfSchema], summary="Get all bookshelves of the current user")
 async def get_bookshelves(
-        db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Retrieve all bookshelves belonging to the current user.
     """
 
+    # Plain rows, no ORM objects
     result = await db.execute(
-        select(BookShelfModel).where(
+        select(
+            BookShelfModel.id,
+            BookShelfModel.name,
+            BookShelfModel.description,
+            BookShelfModel.created_at,
+        ).where(
             BookShelfModel.user_id == current_user.id,
         )
     )
 
-    bookshelves = result.scalars().all()
-
-    return [
-        BookShelfSchema(
-            id=b.id,
-            name=b.name,
-            description=b.description,
-            created_at=b.created_at,
-            books=[]
-        )
-        for b in bookshelves
-    ]
+    return [BookShelfSchema(**row._mapping) for row in result.all()]
 
 
 @router.get("/{bookshelf_id}", response_model=BookShelfList, summary="Get a specific bookshelf with full book details")
 async def get_bookshelf(
         bookshelf_id: int,
-        request: Request,
+        enrichment: EnrichmentQueue = Depends(get_enrichment_queue),
+        repository: BookRepository = Depends(get_book_repository),
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
      Retrieve a specific bookshelf by its ID, including all books it contains.
 
     - Returns full book details: title, authors, year, cover URL, and date added to the shelf
+    - Books without local details are returned as skeletons and enriched in the background
     """
 
     # Get the bookshelf
@@ -125,36 +127,31 @@ async def get_bookshelf(
             detail="Bookshelf not found"
         )
 
-    service = request.app.state.open_library_service
-    books_full = []
+    # Get all books of the shelf from the local books table in one query
+    books = await repository.get_many([book_in_shelf.work_olid for book_in_shelf in bookshelf.books])
 
-    for book_in_shelf in bookshelf.books:
-        # Try to get the book from local books table
-        book = await db.scalar(
-            select(BookModel).where(BookModel.work_olid == book_in_shelf.work_olid)
-        )
+    # Queue the ones not found locally or not yet hydrated for background enrichment
+    missing = [
+        work_olid for work_olid, book in books.items()
+        if (book is None or book.title is None) and WORK_OLID_RE.match(work_olid)
+    ]
+    if missing:
+        await enrichment.enqueue(db, missing)
+        await db.commit()
+        enrichment.notify()
 
-        # If not found locally, fetch from Open Library
-        if not book:
-            book_data = await service.get_book_by_work(book_in_shelf.work_olid)
-            if book_data:
-                book = BookModel(
-                    work_olid=book_in_shelf.work_olid,
-                    title=book_data.get("title"),
-                    authors=", ".join(book_data.get("authors") or []),
-                    cover_url=book_data.get("cover_url"),
-                    published_year=book_data.get("year"),
-                )
-                db.add(book)
-                await db.commit()
-                await db.refresh(book)
+    # Author lists of all books on the shelf in one query
+    authors = await get_book_authors(db, list(books))
 
+    books_full = []
+    for book_in_shelf in bookshelf.books:
+        book = books.get(book_in_shelf.work_olid)
         books_full.append(
             BookInShelfSchema(
                 id=book_in_shelf.id,
                 work_olid=book_in_shelf.work_olid,
                 title=book.title if book else None,
-                authors=book.authors.split(", ") if book and book.authors else [],
+                authors=authors.get(book_in_shelf.work_olid, []),
                 year=book.published_year if book else None,
                 cover_url=book.cover_url if book else None,
                 added_at=book_in_shelf.added_at,
@@ -175,7 +172,7 @@ async def add_book_in_shelf(
         bookshelf_id: int,
         book_data: BookAdd,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Add a book to a user's bookshelf.
@@ -230,12 +227,110 @@ async def add_book_in_shelf(
     )
 
 
+@router.post("/{bookshelf_id}/books/bulk", response_model=BulkResult, summary="Add many books to a bookshelf")
+async def add_books_in_shelf_bulk(
+        bookshelf_id: int,
+        data: BulkWorks,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Principal = Depends(get_current_principal),
+        books: BookRepository = Depends(get_book_repository),
+):
+    """
+    Add many books to a user's bookshelf in one request.
+
+    - Books missing from the local books table are resolved from Open Library in one batch,
+      queued behind interactive requests
+    - All books are inserted with a single statement and committed together
+    - Each book is reported as `added`, `already_present` or `unknown` (not found on Open Library)
+    - If Open Library cannot be reached for books missing locally, nothing is added and 503 is returned
+      with Retry-After, so an outage is never reported as `unknown`
+    """
+
+    bookshelf = await db.scalar(
+        select(BookShelfModel).where(
+            BookShelfModel.id == bookshelf_id,
+            BookShelfModel.user_id == current_user.id,
+        )
+    )
+
+    if not bookshelf:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bookshelf not found"
+        )
+
+    work_olids = list(dict.fromkeys(data.work_olids))
+    found = await books.get_or_fetch(work_olids, priority=BULK)
+    known = {work_olid for work_olid, book in found.items() if book}
+
+    added = set()
+    if known:
+        result = await db.execute(
+            insert(BookInShelfModel)
+            .values([
+                {"bookshelf_id": bookshelf.id, "work_olid": work_olid}
+                for work_olid in work_olids if work_olid in known
+            ])
+            .on_conflict_do_nothing(index_elements=[BookInShelfModel.bookshelf_id, BookInShelfModel.work_olid])
+            .returning(BookInShelfModel.work_olid)
+        )
+        added = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_additions(work_olids, known, added)
+
+
+@router.post("/{bookshelf_id}/books/bulk/remove", response_model=BulkResult, summary="Remove many books from a bookshelf")
+async def delete_books_from_shelf_bulk(
+        bookshelf_id: int,
+        data: BulkWorks,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Remove many books from a user's bookshelf with a single statement.
+
+    - Books are identified by work OLID
+    - Each book is reported as `removed` or `not_present`
+    """
+
+    bookshelf = await db.scalar(
+        select(BookShelfModel).where(
+            BookShelfModel.id == bookshelf_id,
+            BookShelfModel.user_id == current_user.id,
+        )
+    )
+
+    if not bookshelf:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bookshelf not found"
+        )
+
+    work_olids = list(dict.fromkeys(data.work_olids))
+
+    result = await db.execute(
+        delete(BookInShelfModel)
+        .where(
+            BookInShelfModel.bookshelf_id == bookshelf.id,
+            BookInShelfModel.work_olid.in_(work_olids),
+        )
+        .returning(BookInShelfModel.work_olid)
+    )
+    removed = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_removals(work_olids, removed)
+
+
 @router.patch("/{bookshelf_id}", response_model=BookShelfSchema, summary="Update a bookshelf")
 async def update_bookshelf(
         bookshelf_id: int,
         bookshelf_data: BookShelfUpdate,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Update a specific bookshelf of the current user.
@@ -280,7 +375,7 @@ async def update_bookshelf(
 async def delete_bookshelf(
         bookshelf_id: int,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Delete a specific bookshelf of the current user.
@@ -311,7 +406,7 @@ async def delete_book_from_shelf(
         bookshelf_id: int,
         book_id: int,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_principal)
 ):
     """
     Delete a specific book from a user's bookshelf.
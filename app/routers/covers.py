@@ -0,0 +1,59 @@
+from typing import Literal
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from PIL import UnidentifiedImageError
+
+from app.depends import get_cover_cache
+from app.services.covers import CoverCache
+
+
+router = APIRouter(
+    prefix="/covers",
+    tags=["covers"],
+)
+
+# Cover images never change for a given cover ID
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{cover_id}", summary="Get a book cover image")
+async def get_cover(
+        cover_id: int,
+        size: Literal["S", "M", "L"] = Query("L", description="S, M (thumbnails) or L (original)"),
+        if_none_match: str | None = Header(None),
+        covers: CoverCache = Depends(get_cover_cache),
+):
+    """
+    Returns an Open Library cover image from the local cover cache.
+
+    - The image is fetched from Open Library once; thumbnails are generated locally
+    - Responses carry a strong ETag and can be cached by clients for a year
+    """
+    try:
+        cover = await covers.get(cover_id, size)
+    except httpx.HTTPError:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Cover could not be fetched from Open Library",
+        )
+    except UnidentifiedImageError:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Open Library returned an invalid cover image",
+        )
+
+    if cover is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cover not found",
+        )
+
+    path, digest = cover
+    headers = {"ETag": f'"{digest}"', "Cache-Control": CACHE_CONTROL}
+
+    if if_none_match is not None and f'"{digest}"' in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Request, Query, HTTPException, status, Depends
+from fastapi import APIRouter, Query, HTTPException, status, Depends
 from sqlalchemy import select, func, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.depends import get_async_db
+from app.depends import get_async_db, get_read_db, get_enrichment_queue, get_book_repository
+from app.services.enrichment import EnrichmentQueue
+from app.services.open_library import WORK_OLID_RE
+from app.services.books import BookRepository
+from app.services.scheduler import BULK
 from app.models.favorites import Favorite as FavoriteModel
-from app.models.users import User as UserModel
 from app.models.books import Book as BookModel
+from app.services.authors import get_book_authors
+from app.pagination import Keyset
 
 from app.schemas.favorites import Favorite as FavoriteSchema, FavoriteList
-from app.auth import get_current_user
+from app.schemas.bulk import BulkWorks, BulkResult
+from app.auth import Principal, get_current_principal
 
 
 router = APIRouter(
@@ -16,95 +23,170 @@ router = APIRouter(
     tags=["favorites"],
 )
 
+# Newest favorites first
+FAVORITES_KEYSET = Keyset(FavoriteModel.created_at, FavoriteModel.id)
+
 
 @router.get("/", response_model=FavoriteList, summary="Get paginated list of favorite books")
 async def get_favorites(
-    request: Request,
+    enrichment: EnrichmentQueue = Depends(get_enrichment_queue),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    current_user: UserModel = Depends(get_current_user),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page; overrides `page`"),
+    current_user: Principal = Depends(get_current_principal),
+    read_db: AsyncSession = Depends(get_read_db),
     db: AsyncSession = Depends(get_async_db),
 ) -> FavoriteList:
     """
-    Returns a paginated list of the current user's favorite books.
+    Returns a paginated list of the current user's favorite books, newest first.
 
-    - Fetches book details from local DB or Open Library if missing
+    - Pass `next_cursor` back as `cursor` to read the next page; cursor pages skip the total count
+    - `page` (offset mode) is kept for compatibility
+    - Book details come from the local books table
+    - Books without local details are queued for background enrichment
     """
-    total = await db.scalar(
-        select(func.count())
-        .select_from(FavoriteModel)
-        .where(FavoriteModel.user_id == current_user.id)
-    )
-    offset = (page - 1) * page_size
+    total = None
+    if cursor is None:
+        total = await read_db.scalar(
+            select(func.count())
+            .select_from(FavoriteModel)
+            .where(FavoriteModel.user_id == current_user.id)
+        )
 
-    # Retrieve the current user's favorite records from the database
-    result = await db.execute(
-        select(FavoriteModel)
-        .where(FavoriteModel.user_id == current_user.id)
-        .limit(page_size)
-        .offset(offset)
+    # Plain rows of the favorites with their book details, no ORM objects
+    result = await read_db.execute(
+        FAVORITES_KEYSET.apply(
+            select(
+                FavoriteModel.id,
+                FavoriteModel.work_olid,
+                FavoriteModel.created_at,
+                BookModel.id.label("book_id"),
+                BookModel.title,
+                BookModel.published_year.label("year"),
+                BookModel.cover_url,
+            )
+            .outerjoin(BookModel, BookModel.work_olid == FavoriteModel.work_olid)
+            .where(FavoriteModel.user_id == current_user.id),
+            cursor, page, page_size,
+        )
     )
-    favorites = result.scalars().all()
+    rows, next_cursor = FAVORITES_KEYSET.trim(result.all(), page_size)
 
-    items = []
-    service = request.app.state.open_library_service
+    # Queue missing and not yet hydrated (skeleton) books for background enrichment;
+    # pending tasks are left alone and failed ones are revived
+    missing = [row.work_olid for row in rows if row.title is None]
+    if missing:
+        await enrichment.enqueue(db, missing)
+        await db.commit()
+        enrichment.notify()
 
-    # Check if the book exists in the local books table
-    for fav in favorites:
-        book = await db.scalar(
-            select(BookModel).where(BookModel.work_olid == fav.work_olid)
-        )
+    # Author lists of all books on the page in one query
+    authors = await get_book_authors(read_db, [row.work_olid for row in rows])
 
-    # If not, fetch the book data from Open Library
-        if not book:
-            book_data = await service.get_book_by_work(fav.work_olid)
-            if book_data:
-                book = BookModel(
-                    work_olid=fav.work_olid,
-                    title=book_data.get("title"),
-                    authors=", ".join(book_data.get("authors") or []),
-                    cover_url=book_data.get("cover_url"),
-                    published_year=book_data.get("year"),
-                )
-                db.add(book)
-                await db.commit()
-                await db.refresh(book)
-
-        items.append(
-            FavoriteSchema(
-                id=fav.id,
-                work_olid=fav.work_olid,
-                title=book.title if book else None,
-                authors=book.authors.split(", ") if book and book.authors else None,
-                year=book.published_year if book else None,
-                cover_url=book.cover_url if book else None,
-                created_at=fav.created_at,
-            )
+    items = [
+        FavoriteSchema(
+            id=row.id,
+            work_olid=row.work_olid,
+            title=row.title,
+            authors=authors.get(row.work_olid),
+            year=row.year,
+            cover_url=row.cover_url,
+            created_at=row.created_at,
         )
+        for row in rows
+    ]
 
     return FavoriteList(
         items=items,
         total=total,
-        page=page,
+        page=page if cursor is None else None,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
+@router.post("/bulk", response_model=BulkResult, summary="Add many books to favorites")
+async def add_many_to_favorites(
+    data: BulkWorks,
+    books: BookRepository = Depends(get_book_repository),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkResult:
+    """
+    Adds many books to the current user's favorites in one request.
+
+    - Books missing from the local books table are resolved from Open Library in one batch,
+      queued behind interactive requests
+    - All favorites are inserted with a single statement and committed together
+    - Each book is reported as `added`, `already_present` or `unknown` (not found on Open Library)
+    - If Open Library cannot be reached for books missing locally, nothing is added and 503 is returned
+      with Retry-After, so an outage is never reported as `unknown`
+    """
+    work_olids = list(dict.fromkeys(data.work_olids))
+    found = await books.get_or_fetch(work_olids, priority=BULK)
+    known = {work_olid for work_olid, book in found.items() if book}
+
+    added = set()
+    if known:
+        result = await db.execute(
+            insert(FavoriteModel)
+            .values([
+                {"work_olid": work_olid, "user_id": current_user.id}
+                for work_olid in work_olids if work_olid in known
+            ])
+            .on_conflict_do_nothing(index_elements=[FavoriteModel.work_olid, FavoriteModel.user_id])
+            .returning(FavoriteModel.work_olid)
+        )
+        added = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_additions(work_olids, known, added)
+
+
+@router.post("/bulk/remove", response_model=BulkResult, summary="Remove many books from favorites")
+async def remove_many_from_favorites(
+    data: BulkWorks,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> BulkResult:
+    """
+    Removes many books from the current user's favorites with a single statement.
+
+    - Each book is reported as `removed` or `not_present`
+    """
+    work_olids = list(dict.fromkeys(data.work_olids))
+
+    result = await db.execute(
+        delete(FavoriteModel)
+        .where(
+            FavoriteModel.user_id == current_user.id,
+            FavoriteModel.work_olid.in_(work_olids),
+        )
+        .returning(FavoriteModel.work_olid)
+    )
+    removed = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_removals(work_olids, removed)
+
+
 @router.post("/{work_olid}", response_model=FavoriteSchema, status_code=status.HTTP_201_CREATED, summary="Add a book to favorites")
 async def add_to_favorite(
     work_olid: str,
-    request: Request,
-    current_user: UserModel = Depends(get_current_user),
+    enrichment: EnrichmentQueue = Depends(get_enrichment_queue),
+    books: BookRepository = Depends(get_book_repository),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_async_db),
 ) -> FavoriteSchema:
     """
     Adds a book to the current user's favorites list by its OLID.
 
     - Checks if already in favorites
-    - Fetches book details from local DB or Open Library if missing
+    - Book details come from the local books table; unknown books are added
+      with skeleton details and enriched from Open Library in the background
     """
-    service = request.app.state.open_library_service
-
     # Check if the book is already in favorites
     exists = await db.scalar(
         select(FavoriteModel).where(
@@ -118,28 +200,17 @@ async def add_to_favorite(
             detail="This book is already in favorites",
         )
 
-    # Check if the book exists in `books`, if not fetch from Open Library
-    book = await db.scalar(select(BookModel).where(BookModel.work_olid == work_olid))
+    # Check if the book exists in `books`, if not queue it for enrichment
+    book = await books.get(work_olid)
     if not book:
-        book_data = await service.get_book_by_work(work_olid)
-        if not book_data:
+        if not WORK_OLID_RE.match(work_olid):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Book not found in Open Library",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid work OLID",
             )
 
-        # Save book to books
-        book = BookModel(
-            work_olid=work_olid,
-            title=book_data.get("title"),
-            authors=", ".join(book_data.get("authors") or []),
-            cover_url=book_data.get("cover_url"),
-            published_year=book_data.get("year"),
-        )
-
-        db.add(book)
-        await db.commit()
-        await db.refresh(book)
+        # Skeleton row; details are filled in by the enrichment workers
+        await enrichment.enqueue(db, [work_olid])
 
     # Add to favorites
     favorite = FavoriteModel(
@@ -151,15 +222,18 @@ async def add_to_favorite(
     await db.commit()
     await db.refresh(favorite)
 
-    authors_list = book.authors.split(", ") if book.authors else None
+    if not book:
+        enrichment.notify()
+
+    authors = await get_book_authors(db, [work_olid])
 
     return FavoriteSchema(
         id=favorite.id,
-        work_olid=book.work_olid,
-        title=book.title,
-        authors=authors_list,
-        year=book.published_year,
-        cover_url=book.cover_url,
+        work_olid=work_olid,
+        title=book.title if book else None,
+        authors=authors.get(work_olid),
+        year=book.published_year if book else None,
+        cover_url=book.cover_url if book else None,
         created_at=favorite.created_at,
     )
 
@@ -167,7 +241,7 @@ async def add_to_favorite(
 @router.delete("/{work_olid}", status_code=status.HTTP_204_NO_CONTENT, summary="Remove a book from favorites")
 async def remove_from_favorite(
     olid_id: str,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_async_db),
 ) -> None:
     """
@@ -8,7 +8,8 @@ from app.models.reviews import Review as ReviewModel
 from app.models.users import User as UserModel
 
 from app.schemas.reviews import Review as ReviewSchema, ReviewUpdate
-from app.auth import get_current_user
+from app.auth import Principal, get_current_principal
+from app.services.ratings import apply_rating_change
 
 
 router = APIRouter(
@@ -22,7 +23,7 @@ async def patch_review(
     review_id: int,
     review: ReviewUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Update a review.
@@ -30,8 +31,9 @@ async def patch_review(
     - Admin can update any review
     """
 
+    # Locked until commit so concurrent edits apply their rating deltas one after another
     review_db = await db.scalar(
-        select(ReviewModel).where(ReviewModel.id == review_id)
+        select(ReviewModel).where(ReviewModel.id == review_id).with_for_update()
     )
 
     if not review_db:
@@ -46,6 +48,8 @@ async def patch_review(
             detail="You can edit only your own review",
         )
 
+    old_rating = review_db.rating
+
     update_data = review.model_dump(exclude_unset=True)
 
     if not update_data:
@@ -59,18 +63,23 @@ async def patch_review(
 
     review_db.updated_at = datetime.now(timezone.utc)
 
+    if "rating" in update_data:
+        await apply_rating_change(db, review_db.work_olid, old=old_rating, new=review_db.rating)
+
     db.add(review_db)
     await db.commit()
     await db.refresh(review_db)
 
-    return review_db
+    username = await db.scalar(select(UserModel.username).where(UserModel.id == review_db.user_id))
+
+    return ReviewSchema.model_validate(review_db).model_copy(update={"username": username})
 
 
 @router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete a review")
 async def delete_review(
     review_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Delete a review.
@@ -79,7 +88,7 @@ async def delete_review(
     """
 
     review_db = await db.scalar(
-        select(ReviewModel).where(ReviewModel.id == review_id)
+        select(ReviewModel).where(ReviewModel.id == review_id).with_for_update()
     )
 
     if not review_db:
@@ -94,6 +103,7 @@ async def delete_review(
             detail="You can delete only your own review",
         )
 
+    await apply_rating_change(db, review_db.work_olid, old=review_db.rating)
     await db.delete(review_db)
     await db.commit()
 
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 from datetime import datetime, UTC
 
-from app.depends import get_async_db
+from app.depends import get_async_db, get_read_db, get_enrichment_queue, get_book_repository
 from app.models.user_books import UserBook as UserBookModel
-from app.models.users import User as UserModel
 from app.models.books import Book as BookModel
+from app.services.authors import get_book_authors
 
-from app.schemas.user_books import UserBook as UserBookSchema, UserBookAdd, ReadingStatus, UserBookUpdate
-from app.auth import get_current_user
-from app.services.open_library import OpenLibraryService
+from app.schemas.user_books import UserBook as UserBookSchema, UserBookAdd, ReadingStatus, UserBookUpdate, UserBookBulkAdd
+from app.schemas.bulk import BulkWorks, BulkResult
+from app.auth import Principal, get_current_principal
+from app.services.enrichment import EnrichmentQueue
+from app.services.open_library import WORK_OLID_RE
+from app.services.books import BookRepository
+from app.services.scheduler import BULK
+from app.pagination import Keyset, NEXT_CURSOR_HEADER
 
 
 router = APIRouter(
@@ -19,17 +24,23 @@ router = APIRouter(
     tags=["user-books"],
 )
 
+# Most recently added books first
+USER_BOOKS_KEYSET = Keyset(UserBookModel.created_at, UserBookModel.id)
+
 
 @router.post("/", response_model=UserBookSchema, status_code=status.HTTP_201_CREATED, summary="Add a book to user's reading list")
 async def add_user_book(
         book_data: UserBookAdd,
         db: AsyncSession = Depends(get_async_db),
-        current_user: UserModel = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_principal),
+        enrichment: EnrichmentQueue = Depends(get_enrichment_queue),
+        books: BookRepository = Depends(get_book_repository),
 ):
     """
     Add a book to the current user's personal reading list.
 
-    - If the book does not exist locally, it will be fetched from OpenLibrary
+    - If the book does not exist locally, it is returned with skeleton details
+      and enriched from OpenLibrary in the background
     - Default status is `PLANNED`
     - Progress and rating can be set during creation
     """
@@ -48,27 +59,12 @@ async def add_user_book(
         )
 
     # Check if book exists in local books table
-    book = await db.scalar(
-        select(BookModel).where(BookModel.work_olid == book_data.work_olid)
-    )
+    book = await books.get(book_data.work_olid)
 
-    # If not — fetch from OpenLibrary and save
-    if not book:
-        async with httpx.AsyncClient(base_url="https://openlibrary.org") as client:
-            service = OpenLibraryService(client)
-            book_data_ol = await service.get_book_by_work(book_data.work_olid)
-
-        if book_data_ol:
-            book = BookModel(
-                work_olid=book_data_ol["work_olid"],
-                title=book_data_ol["title"],
-                authors=", ".join(book_data_ol["authors"]) if book_data_ol["authors"] else None,
-                cover_url=book_data_ol["cover_url"],
-                published_year=book_data_ol["year"],
-            )
-            db.add(book)
-            await db.commit()
-            await db.refresh(book)
+    # If not — queue it for enrichment from OpenLibrary
+    enqueued = not book and bool(WORK_OLID_RE.match(book_data.work_olid))
+    if enqueued:
+        await enrichment.enqueue(db, [book_data.work_olid])
 
     user_book = UserBookModel(
         user_id=current_user.id,
@@ -82,6 +78,11 @@ async def add_user_book(
     await db.commit()
     await db.refresh(user_book)
 
+    if enqueued:
+        enrichment.notify()
+
+    authors = await get_book_authors(db, [user_book.work_olid])
+
     return UserBookSchema(
         id=user_book.id,
         work_olid=user_book.work_olid,
@@ -93,33 +94,129 @@ async def add_user_book(
         created_at=user_book.created_at,
         updated_at=user_book.updated_at,
         title=book.title if book else None,
-        authors=book.authors.split(", ") if book and book.authors else [],
+        authors=authors.get(user_book.work_olid, []),
         cover_url=book.cover_url if book else None,
         published_year=book.published_year if book else None
     )
 
 
 
+@router.post("/bulk", response_model=BulkResult, summary="Add many books to user's reading list")
+async def add_user_books_bulk(
+        data: UserBookBulkAdd,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Principal = Depends(get_current_principal),
+        books: BookRepository = Depends(get_book_repository),
+):
+    """
+    Add many books to the current user's personal reading list in one request.
+
+    - Books missing from the local books table are resolved from Open Library in one batch,
+      queued behind interactive requests
+    - All entries are inserted with a single statement and committed together
+    - Each book is reported as `added`, `already_present` or `unknown` (not found on Open Library)
+    - If Open Library cannot be reached for books missing locally, nothing is added and 503 is returned
+      with Retry-After, so an outage is never reported as `unknown`
+    - If a work OLID is repeated, the first entry wins
+    """
+
+    items = {}
+    for item in data.items:
+        items.setdefault(item.work_olid, item)
+
+    work_olids = list(items)
+    found = await books.get_or_fetch(work_olids, priority=BULK)
+    known = {work_olid for work_olid, book in found.items() if book}
+
+    added = set()
+    if known:
+        result = await db.execute(
+            insert(UserBookModel)
+            .values([
+                {
+                    "user_id": current_user.id,
+                    "work_olid": work_olid,
+                    "status": item.status,
+                    "progress_percent": item.progress_percent,
+                    "rating": item.rating,
+                }
+                for work_olid, item in items.items() if work_olid in known
+            ])
+            .on_conflict_do_nothing(index_elements=[UserBookModel.user_id, UserBookModel.work_olid])
+            .returning(UserBookModel.work_olid)
+        )
+        added = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_additions(work_olids, known, added)
+
+
+@router.post("/bulk/remove", response_model=BulkResult, summary="Remove many books from user's reading list")
+async def delete_user_books_bulk(
+        data: BulkWorks,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Remove many books from the current user's personal reading list with a single statement.
+
+    - Books are identified by work OLID
+    - Each book is reported as `removed` or `not_present`
+    """
+
+    work_olids = list(dict.fromkeys(data.work_olids))
+
+    result = await db.execute(
+        delete(UserBookModel)
+        .where(
+            UserBookModel.user_id == current_user.id,
+            UserBookModel.work_olid.in_(work_olids),
+        )
+        .returning(UserBookModel.work_olid)
+    )
+    removed = set(result.scalars().all())
+
+    await db.commit()
+
+    return BulkResult.for_removals(work_olids, removed)
+
+
 @router.get("/", response_model=list[UserBookSchema], summary="Get user's reading list",)
 async def get_user_books(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="`X-Next-Cursor` header of the previous page; overrides `page`"),
     status_filter: ReadingStatus | None = Query(None),
-    db: AsyncSession = Depends(get_async_db),
-    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
-    Retrieve the current user's personal reading list.
+    Retrieve the current user's personal reading list, most recently added first.
 
     - Optional filtering by `status` (PLANNED, READING, COMPLETED)
-    - Pagination supported via `page` and `page_size`
+    - Pagination via `cursor` (taken from the `X-Next-Cursor` response header) and `page_size`
+    - `page` (offset mode) is kept for compatibility
     - Returns full book details (title, authors, cover, year) along with user progress and rating
     """
 
-    offset = (page - 1) * page_size
-
+    # Plain rows with the book details, no ORM objects
     query = (
-        select(UserBookModel, BookModel)
+        select(
+            UserBookModel.id,
+            UserBookModel.work_olid,
+            UserBookModel.status,
+            UserBookModel.progress_percent,
+            UserBookModel.rating,
+            UserBookModel.started_at,
+            UserBookModel.finished_at,
+            UserBookModel.created_at,
+            UserBookModel.updated_at,
+            BookModel.title,
+            BookModel.cover_url,
+            BookModel.published_year,
+        )
         .outerjoin(BookModel, BookModel.work_olid == UserBookModel.work_olid)
         .where(UserBookModel.user_id == current_user.id)
     )
@@ -127,33 +224,18 @@ async def get_user_books(
     if status_filter:
         query = query.where(UserBookModel.status == status_filter)
 
-    query = query.limit(page_size).offset(offset)
-
-    result = await db.execute(query)
-    rows = result.all()
-
-    books_full = []
-
-    for user_book, book in rows:
-        books_full.append(
-            UserBookSchema(
-                id=user_book.id,
-                work_olid=user_book.work_olid,
-                status=user_book.status.value,
-                progress_percent=user_book.progress_percent,
-                rating=user_book.rating,
-                started_at=user_book.started_at,
-                finished_at=user_book.finished_at,
-                created_at=user_book.created_at,
-                updated_at=user_book.updated_at,
-                title=book.title if book else None,
-                authors=book.authors.split(", ") if book and book.authors else [],
-                cover_url=book.cover_url if book else None,
-                published_year=book.published_year if book else None
-            )
-        )
+    result = await db.execute(USER_BOOKS_KEYSET.apply(query, cursor, page, page_size))
+    rows, next_cursor = USER_BOOKS_KEYSET.trim(result.all(), page_size)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
-    return books_full
+    # Author lists of all books on the page in one query
+    authors = await get_book_authors(db, [row.work_olid for row in rows])
+
+    return [
+        UserBookSchema(**row._mapping, authors=authors.get(row.work_olid, []))
+        for row in rows
+    ]
 
 
 @router.patch("/{user_book_id}", response_model=UserBookSchema, summary="Update a book in user's reading list")
@@ -161,7 +243,8 @@ async def update_user_book(
     user_book_id: int,
     book_update: UserBookUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
+    books: BookRepository = Depends(get_book_repository),
 ):
     """
     Partially update a book in the user's reading list.
@@ -231,9 +314,8 @@ async def update_user_book(
     await db.commit()
     await db.refresh(user_book)
 
-    book = await db.scalar(
-        select(BookModel).where(BookModel.work_olid == user_book.work_olid)
-    )
+    book = await books.get(user_book.work_olid)
+    authors = await get_book_authors(db, [user_book.work_olid])
 
     return UserBookSchema(
         id=user_book.id,
@@ -246,7 +328,7 @@ async def update_user_book(
         created_at=user_book.created_at,
         updated_at=user_book.updated_at,
         title=book.title if book else None,
-        authors=book.authors.split(", ") if book and book.authors else [],
+        authors=authors.get(user_book.work_olid, []),
         cover_url=book.cover_url if book else None,
         published_year=book.published_year if book else None
     )
@@ -256,7 +338,7 @@ async def update_user_book(
 async def delete_user_book(
     user_book_id: int,
     db: AsyncSession = Depends(get_async_db),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Delete a book from the current user's personal reading list.
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.users import User as UserModel
 from app.schemas.users import User as UserSchema, UserCreate, UserUpdate
-from app.depends import get_async_db
+from app.depends import get_async_db, get_user_cache, get_token_denylist
 from app.auth import hash_password
-from app.auth import get_current_user, get_current_admin
+from app.auth import Principal, get_current_user, get_current_principal, get_current_admin
+from app.pagination import Keyset, NEXT_CURSOR_HEADER
+from app.services.ratings import subtract_user_reviews
+from app.services.refresh_tokens import revoke_user_refresh_tokens
+from app.services.token_denylist import TokenDenylist, DELETED_USER_VERSION, revoke_user_tokens
+from app.services.user_cache import UserCache, publish_user_change
 
 
 router = APIRouter(
@@ -14,6 +19,9 @@ router = APIRouter(
     tags=["users"],
 )
 
+# Oldest accounts first
+USERS_KEYSET = Keyset(UserModel.created_at, UserModel.id, descending=False)
+
 
 @router.get("/me", response_model=UserSchema, summary="Get current user info")
 async def get_me(
@@ -27,23 +35,33 @@ async def get_me(
 
 @router.get("/", response_model=list[UserSchema], summary="Get all users")
 async def get_users(
-    admin: UserModel = Depends(get_current_admin),
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="`X-Next-Cursor` header of the previous page; overrides `page`"),
+    admin: Principal = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Returns a list of all registered users.
+    Returns a paginated list of registered users, oldest first.
 
     - Only accessible to admins
+    - Pagination via `cursor` (taken from the `X-Next-Cursor` response header) and `page_size`
+    - `page` (offset mode) is kept for compatibility
     """
 
-    result = await db.scalars(select(UserModel))
-    return result.all()
+    result = await db.scalars(USERS_KEYSET.apply(select(UserModel), cursor, page, page_size))
+    users, next_cursor = USERS_KEYSET.trim(result.all(), page_size)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return users
 
 
 @router.get("/{user_id}", response_model=UserSchema, summary="Get user by ID")
 async def get_user(
     user_id: int,
-    admin: UserModel = Depends(get_current_admin),
+    admin: Principal = Depends(get_current_admin),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
@@ -67,8 +85,10 @@ async def get_user(
 async def update_user(
     user_id: int,
     data: UserUpdate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_async_db),
+    user_cache: UserCache = Depends(get_user_cache),
+    denylist: TokenDenylist = Depends(get_token_denylist),
 ):
     """
     Update information of a user.
@@ -91,6 +111,8 @@ async def update_user(
     if not (is_admin or is_owner):
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
+    role, is_active = user.role, user.is_active
+
     if not is_admin and data.username is not None:
         user.username = data.username
 
@@ -102,8 +124,19 @@ async def update_user(
         if data.is_active is not None:
             user.is_active = data.is_active
 
+    # Tokens carry the role and are accepted until they expire, so revoke them
+    revoked = user.role != role or (is_active and not user.is_active)
+    if revoked:
+        user.token_version += 1
+        await revoke_user_tokens(db, user.id, user.token_version)
+        await revoke_user_refresh_tokens(db, user.id)
+
     db.add(user)
+    await publish_user_change(db, user.email)
     await db.commit()
+    user_cache.invalidate(user.email)
+    if revoked:
+        denylist.revoke(user.id, user.token_version)
     await db.refresh(user)
 
     return user
@@ -112,8 +145,10 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete a user")
 async def delete_user(
     user_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_async_db),
+    user_cache: UserCache = Depends(get_user_cache),
+    denylist: TokenDenylist = Depends(get_token_denylist),
 ):
     """
     Delete a user by ID.
@@ -136,8 +171,14 @@ async def delete_user(
     if not (is_admin or is_owner):
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
+    # The user's reviews are deleted by cascade
+    await subtract_user_reviews(db, user.id)
     await db.delete(user)
+    await revoke_user_tokens(db, user.id, DELETED_USER_VERSION)
+    await publish_user_change(db, user.email)
     await db.commit()
+    user_cache.invalidate(user.email)
+    denylist.revoke(user_id, DELETED_USER_VERSION)
     return None
 
 
@@ -163,7 +204,7 @@ async def create_user(
     db_user = UserModel(
         email=user.email,
         username=user.username,
-        hashed_password=hash_password(user.password),
+        hashed_password=await hash_password(user.password),
         role="user",
         is_active=True,
     )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.schemas.covers import CoverUrl
+
 
 class Book(BaseModel):
     """
@@ -13,7 +15,7 @@ class Book(BaseModel):
     year: int | None = Field(None, description="First published year")
     isbn: list[str] | None = Field(None, description="Book ISBN")
     pages: int | None = Field(None, description="Book pages")
-    cover_url: str | None = Field(None, description="Cover URL")
+    cover_url: CoverUrl = Field(None, description="Cover URL")
     subject: list[str] | None = Field(None, description="Book subject")
     publisher: list[str] | None = Field(None, description="Book publisher")
 
@@ -28,7 +30,7 @@ class BooksSearchItem(BaseModel):
     title: str | None = Field(None, description="Book title")
     authors: list[str] | None = Field(None, description="Authors names")
     year: int | None = Field(None, description="First published year")
-    cover_url: str | None = Field(None, description="Book cover URL")
+    cover_url: CoverUrl = Field(None, description="Book cover URL")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 
+from app.schemas.covers import CoverUrl
+
 
 class BookInShelf(BaseModel):
     """
@@ -11,7 +13,7 @@ class BookInShelf(BaseModel):
     title: str | None = Field(None, description="Book title")
     authors: list[str] = Field(default_factory=list, description="Book authors")
     year: int | None = Field(None, description="Publication year")
-    cover_url: str | None = Field(None, description="URL of book cover")
+    cover_url: CoverUrl = Field(None, description="URL of book cover")
     added_at: datetime | None = Field(None, description="When the book was added to the shelf")
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+
+
+# Max number of books in one bulk request
+BULK_MAX_ITEMS = 500
+
+BulkStatus = Literal["added", "already_present", "unknown", "removed", "not_present"]
+
+
+class BulkWorks(BaseModel):
+    """
+    Schema for adding or removing many books at once.
+    """
+    work_olids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_MAX_ITEMS,
+        description="Open Library work OLIDs of the books",
+    )
+
+
+class BulkItemResult(BaseModel):
+    """
+    Outcome for one book of a bulk request.
+    """
+    work_olid: str = Field(..., description="Open Library work OLID of the book")
+    status: BulkStatus = Field(..., description="What happened to the book")
+
+
+class BulkResult(BaseModel):
+    """
+    Per-book outcomes of a bulk request, in request order.
+    """
+    items: list[BulkItemResult] = Field(..., description="Outcome for every requested book")
+    counts: dict[str, int] = Field(..., description="Number of books by outcome")
+
+    @classmethod
+    def for_additions(cls, work_olids: list[str], known: set[str], added: set[str]) -> "BulkResult":
+        return cls.from_statuses({
+            work_olid: "added" if work_olid in added else "already_present" if work_olid in known else "unknown"
+            for work_olid in work_olids
+        })
+
+    @classmethod
+    def for_removals(cls, work_olids: list[str], removed: set[str]) -> "BulkResult":
+        return cls.from_statuses({
+            work_olid: "removed" if work_olid in removed else "not_present"
+            for work_olid in work_olids
+        })
+
+    @classmethod
+    def from_statuses(cls, statuses: dict[str, str]) -> "BulkResult":
+        counts: dict[str, int] = {}
+        for status in statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+
+        return cls(
+            items=[BulkItemResult(work_olid=work_olid, status=status) for work_olid, status in statuses.items()],
+            counts=counts,
+        )
@@ -0,0 +1,29 @@
+import re
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+from app.config import COVER_PROXY, COVER_PROXY_BASE_URL
+
+
+OPEN_LIBRARY_COVER_RE = re.compile(r"^https?://covers\.openlibrary\.org/b/id/(\d+)-([SML])\.jpg$")
+
+
+def proxy_cover_url(url: str | None) -> str | None:
+    """
+    Rewrites Open Library cover URLs to the /covers proxy when COVER_PROXY is enabled
+    """
+
+    if not COVER_PROXY or url is None:
+        return url
+
+    match = OPEN_LIBRARY_COVER_RE.match(url)
+    if match is None:
+        return url
+
+    cover_id, size = match.groups()
+    return f"{COVER_PROXY_BASE_URL}/{cover_id}?size={size}"
+
+
+# Cover URL field that follows the COVER_PROXY setting
+CoverUrl = Annotated[str | None, AfterValidator(proxy_cover_url)]
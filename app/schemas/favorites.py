@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
 
+from app.schemas.covers import CoverUrl
+
 
 class Favorite(BaseModel):
     """
@@ -11,7 +13,7 @@ class Favorite(BaseModel):
     title: str | None = Field(None, title="Book title")
     authors: list[str] | None = Field(None, title="List of book authors")
     year: int | None = Field(None, description="First published year")
-    cover_url: str | None = Field(None, title="Cover URL")
+    cover_url: CoverUrl = Field(None, title="Cover URL")
     created_at: datetime | None = Field(None, title="Created at")
 
     @field_validator("authors", mode="before")
@@ -30,8 +32,9 @@ class FavoriteList(BaseModel):
     Paginated list of favorite books.
     """
     items: list[Favorite] = Field(description="Favorite books on this page")
-    total: int = Field(ge=0, description="Total number of favorite books")
-    page: int = Field(ge=1, description="Current page number")
+    total: int | None = Field(None, ge=0, description="Total number of favorite books (offset mode only)")
+    page: int | None = Field(None, ge=1, description="Current page number (offset mode only)")
     page_size: int = Field(ge=1, description="Books per page")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, null on the last page")
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
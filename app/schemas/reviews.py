@@ -24,6 +24,7 @@ class Review(BaseModel):
     """
     id: int = Field(..., description="Review Id")
     user_id: int = Field(..., description="User Id")
+    username: str | None = Field(None, description="Reviewer username")
     rating: float = Field(..., ge=1.0, le=5.0, description="Review rating from 1 to 5")
     comment: str | None = Field(None, description="Review Comment")
     created_at: datetime = Field(..., description="Review Created At")
@@ -37,4 +38,7 @@ class ReviewList(BaseModel):
     Schema for returning list of reviews with average rating.
     """
     avg_rating: float | None = Field(None, ge=1.0, le=5.0, description="Average review rating from 1 to 5")
-    reviews: list[Review] = Field(..., description="List of reviews for the book")
\ No newline at end of file
+    review_count: int = Field(0, ge=0, description="Number of reviews for the book")
+    rating_histogram: dict[int, int] = Field(default_factory=dict, description="Number of reviews by whole stars (1-5)")
+    reviews: list[Review] = Field(..., description="List of reviews for the book")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, null on the last page")
\ No newline at end of file
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 
 from app.models.user_books import ReadingStatus
+from app.schemas.covers import CoverUrl
+from app.schemas.bulk import BULK_MAX_ITEMS
 
 
 class UserBookAdd(BaseModel):
@@ -40,7 +42,13 @@ class UserBook(BaseModel):
     # Book information from the local table
     title: str | None = Field(None, description="Book title")
     authors: list[str] = Field(default_factory=list, description="Book authors")
-    cover_url: str | None = Field(None, description="Book cover url")
+    cover_url: CoverUrl = Field(None, description="Book cover url")
     published_year: int | None = Field(None, description="Book published year")
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class UserBookBulkAdd(BaseModel):
+    """
+    Schema for adding many books to user_books at once.
+    """
+    items: list[UserBookAdd] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS, description="Books to add")
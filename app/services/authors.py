@@ -0,0 +1,148 @@
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.authors import Author as AuthorModel
+from app.models.book_authors import BookAuthor as BookAuthorModel
+from app.models.books import Book as BookModel
+
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_authors_stmt(names: dict[str, str]):
+    """
+    INSERT ... ON CONFLICT statement storing author names keyed by OLID
+    """
+
+    stmt = insert(AuthorModel).values(
+        [{"key": key, "name": name} for key, name in names.items()]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[AuthorModel.key],
+        set_={"name": stmt.excluded.name, "updated_at": datetime.now(timezone.utc)},
+    )
+
+
+class AuthorStore:
+    """
+    Author names stored in the authors table, checked before calling Open Library
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        """
+        Returns names of the known authors, keyed by author OLID
+        """
+
+        if not keys:
+            return {}
+
+        try:
+            async with self.session_maker() as session:
+                result = await session.execute(
+                    select(AuthorModel.key, AuthorModel.name).where(AuthorModel.key.in_(keys))
+                )
+                names = dict(result.tuples().all())
+        except (SQLAlchemyError, OSError):
+            logger.warning("Author lookup failed", exc_info=True)
+            names = {}
+
+        self.hits += len(names)
+        self.misses += len(keys) - len(names)
+        return names
+
+    async def save_many(self, names: dict[str, str]) -> None:
+        """
+        Inserts or updates author names
+        """
+
+        if not names:
+            return
+
+        try:
+            async with self.session_maker() as session:
+                await session.execute(upsert_authors_stmt(names))
+                await session.commit()
+        except (SQLAlchemyError, OSError):
+            logger.warning("Saving %d authors failed", len(names), exc_info=True)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+async def save_book_authors(db: AsyncSession, books: list[dict]) -> None:
+    """
+    Stores the authors of Open Library book dicts and links them to the books.
+
+    - Book rows must already be flushed
+    - Existing links of these books are replaced
+    - The caller commits
+    """
+
+    names: dict[str, str] = {}
+    links = []
+    for book in books:
+        keys = book.get("author_keys") or []
+        authors = book.get("authors") or []
+
+        # Keys and names come from the same Open Library records, in the same order
+        seen = set()
+        for key, name in zip(keys, authors):
+            if key in seen:
+                continue
+            seen.add(key)
+            names[key] = name
+            links.append({"work_olid": book["work_olid"], "author_key": key, "position": len(seen) - 1})
+
+    work_olids = [book["work_olid"] for book in books]
+    if not work_olids:
+        return
+
+    if names:
+        await db.execute(upsert_authors_stmt(names))
+
+    await db.execute(delete(BookAuthorModel).where(BookAuthorModel.work_olid.in_(work_olids)))
+    if links:
+        await db.execute(insert(BookAuthorModel).values(links))
+
+
+async def get_book_authors(db: AsyncSession, work_olids: list[str]) -> dict[str, list[str]]:
+    """
+    Returns author names of local books keyed by work OLID, in Open Library order
+    """
+
+    work_olids = list(dict.fromkeys(work_olids))
+    if not work_olids:
+        return {}
+
+    result = await db.execute(
+        select(BookAuthorModel.work_olid, AuthorModel.name)
+        .join(AuthorModel, AuthorModel.key == BookAuthorModel.author_key)
+        .where(BookAuthorModel.work_olid.in_(work_olids))
+        .order_by(BookAuthorModel.work_olid, BookAuthorModel.position)
+    )
+
+    authors: dict[str, list[str]] = {}
+    for work_olid, name in result.tuples():
+        authors.setdefault(work_olid, []).append(name)
+
+    # Books saved before author links existed only have the joined names column
+    unlinked = [work_olid for work_olid in work_olids if work_olid not in authors]
+    if unlinked:
+        result = await db.execute(
+            select(BookModel.work_olid, BookModel.authors)
+            .where(BookModel.work_olid.in_(unlinked), BookModel.authors != "")
+        )
+        for work_olid, names in result.tuples():
+            authors[work_olid] = names.split(", ")
+
+    return authors
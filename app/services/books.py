@@ -0,0 +1,121 @@
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.books import Book as BookModel, MAX_STORED_SUBJECTS
+from app.services.authors import save_book_authors
+from app.services.open_library import OpenLibraryService, OpenLibraryUnavailable, WORK_OLID_RE
+from app.services.scheduler import run_with_priority
+
+
+# Columns refreshed from Open Library on upsert
+UPSERT_COLUMNS = ("title", "authors", "cover_url", "published_year", "subjects")
+
+
+def book_row(book: dict) -> dict:
+    """
+    books table row for an Open Library book dict
+    """
+
+    return {
+        "work_olid": book["work_olid"],
+        "title": book.get("title"),
+        "authors": ", ".join(book.get("authors") or []),
+        "cover_url": book.get("cover_url"),
+        "published_year": book.get("year"),
+        "subjects": ", ".join((book.get("subject") or [])[:MAX_STORED_SUBJECTS]) or None,
+    }
+
+
+class BookRepository:
+    """
+    Single access path for the books table, bound to the caller's session.
+
+    - Writes are INSERT ... ON CONFLICT (work_olid), so concurrent requests for the same
+      new work never fail on the unique constraint
+    - Rows are written in work_olid order, so overlapping batches lock them in the same order
+    - Nothing is committed here; the caller owns the transaction
+    """
+
+    def __init__(self, db: AsyncSession, service: OpenLibraryService | None = None):
+        self.db = db
+        self.service = service
+
+    async def get(self, work_olid: str) -> BookModel | None:
+        return (await self.get_many([work_olid]))[work_olid]
+
+    async def get_many(self, work_olids: list[str]) -> dict[str, BookModel | None]:
+        """
+        Returns local books rows in request order with one IN query; unknown works map to None
+        """
+
+        books: dict[str, BookModel | None] = dict.fromkeys(work_olids)
+        if books:
+            result = await self.db.execute(select(BookModel).where(BookModel.work_olid.in_(list(books))))
+            books.update((book.work_olid, book) for book in result.scalars())
+        return books
+
+    async def insert_skeletons(self, work_olids: list[str]) -> None:
+        """
+        Inserts empty rows (title NULL) for works to be enriched later; existing rows are left alone
+        """
+
+        work_olids = sorted(set(work_olids))
+        if not work_olids:
+            return
+
+        await self.db.execute(
+            insert(BookModel)
+            .values([{"work_olid": work_olid} for work_olid in work_olids])
+            .on_conflict_do_nothing(index_elements=[BookModel.work_olid])
+        )
+
+    async def upsert_many(self, books: list[dict]) -> None:
+        """
+        Inserts or refreshes books rows and their author links from Open Library book dicts
+        """
+
+        rows = sorted({book["work_olid"]: book_row(book) for book in books}.values(), key=lambda row: row["work_olid"])
+        if not rows:
+            return
+
+        stmt = insert(BookModel).values(rows)
+        stored = tuple_(*[getattr(BookModel, column) for column in UPSERT_COLUMNS])
+        fresh = tuple_(*[stmt.excluded[column] for column in UPSERT_COLUMNS])
+
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[BookModel.work_olid],
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+                # Unchanged rows are not rewritten (no dead tuples, no search_vector recompute)
+                where=stored.is_distinct_from(fresh),
+            )
+        )
+        await save_book_authors(self.db, books)
+
+    async def get_or_fetch(
+            self,
+            work_olids: list[str],
+            priority: str | None = None,
+    ) -> dict[str, BookModel | None]:
+        """
+        Returns books rows in request order.
+        Works without a local row are resolved from Open Library in one batch and stored,
+        at `priority` if given; works unknown to Open Library map to None.
+        Raises OpenLibraryUnavailable if some works could not be looked up, so an outage
+        is not mistaken for missing works.
+        """
+
+        books = await self.get_many(list(dict.fromkeys(work_olids)))
+
+        missing = [work_olid for work_olid, book in books.items() if book is None and WORK_OLID_RE.match(work_olid)]
+        if missing and self.service is not None:
+            lookup = self.service.get_books_by_works(missing)
+            fetched = await (run_with_priority(priority, lookup) if priority is not None else lookup)
+            if any(work_olid not in fetched for work_olid in missing):
+                raise OpenLibraryUnavailable("Some works could not be looked up on Open Library")
+
+            await self.upsert_many([book for book in fetched.values() if book])
+            books.update((work_olid, book) for work_olid, book in (await self.get_many(missing)).items() if book)
+
+        return books
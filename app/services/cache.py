@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.open_library_cache import OpenLibraryCacheEntry
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    In-process LRU cache where every entry has its own expiration time.
+    Expired entries are kept for `stale_ttl` seconds so they can be served as stale.
+    """
+
+    def __init__(self, max_entries: int, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, allow_stale: bool = False) -> Any | None:
+        """
+        Returns a cached value or None if it is missing or expired
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        now = time.monotonic()
+        if expires_at + self.stale_ttl <= now:
+            del self._entries[key]
+            return None
+
+        if expires_at <= now and not allow_stale:
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Stores a value and evicts the least recently used entries over the limit
+        """
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def items(self) -> list[tuple[str, Any]]:
+        """
+        Returns the entries that have not expired, least recently used first
+        """
+
+        now = time.monotonic()
+        return [(key, value) for key, (value, expires_at) in self._entries.items() if expires_at > now]
+
+
+class DatabaseCacheStore:
+    """
+    Persistent cache tier stored in the open_library_cache table
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], stale_ttl: float = 0):
+        self.session_maker = session_maker
+        self.stale_ttl = stale_ttl
+
+    async def get(self, key: str) -> tuple[Any, float] | None:
+        """
+        Returns a cached value with its remaining TTL in seconds.
+        The TTL is negative for stale entries.
+        """
+
+        async with self.session_maker() as session:
+            entry = await session.get(OpenLibraryCacheEntry, key)
+
+        if entry is None:
+            return None
+
+        remaining = (entry.expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining + self.stale_ttl <= 0:
+            return None
+
+        return entry.payload, remaining
+
+    async def set(self, key: str, kind: str, value: Any, ttl: float) -> None:
+        """
+        Inserts or replaces a cached value
+        """
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        stmt = insert(OpenLibraryCacheEntry).values(
+            key=key,
+            kind=kind,
+            payload=value,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OpenLibraryCacheEntry.key],
+            set_={
+                "kind": stmt.excluded.kind,
+                "payload": stmt.excluded.payload,
+                "expires_at": stmt.excluded.expires_at,
+                "updated_at": datetime.now(timezone.utc),
+            },
+        )
+
+        async with self.session_maker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete(self, key: str) -> None:
+        async with self.session_maker() as session:
+            await session.execute(
+                delete(OpenLibraryCacheEntry).where(OpenLibraryCacheEntry.key == key)
+            )
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """
+        Deletes entries past their stale period and returns how many rows were removed
+        """
+
+        async with self.session_maker() as session:
+            result = await session.execute(
+                delete(OpenLibraryCacheEntry)
+                .where(
+                    OpenLibraryCacheEntry.expires_at
+                    <= datetime.now(timezone.utc) - timedelta(seconds=self.stale_ttl)
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+
+class MetadataCache:
+    """
+    Two-tier cache for Open Library responses.
+
+    - First tier: in-process LRU with per-kind TTLs
+    - Second tier (optional): persistent store that survives restarts
+    """
+
+    def __init__(
+            self,
+            ttls: dict[str, int],
+            max_entries: int,
+            store: DatabaseCacheStore | None = None,
+            stale_ttl: float = 0,
+    ):
+        self.ttls = ttls
+        self.memory = LRUCache(max_entries, stale_ttl=stale_ttl)
+        self.store = store
+
+        # Hit/miss counters per kind of entity
+        self.counters: dict[str, dict[str, int]] = {
+            kind: {"memory_hits": 0, "persistent_hits": 0, "stale_hits": 0, "misses": 0}
+            for kind in ttls
+        }
+
+        # Pending writes to the persistent tier
+        self._writes: set[asyncio.Task] = set()
+
+    async def get(self, kind: str, key: str) -> Any | None:
+        """
+        Looks up a fresh value in memory first, then in the persistent tier
+        """
+
+        counters = self.counters[kind]
+
+        value = self.memory.get(key)
+        if value is not None:
+            counters["memory_hits"] += 1
+            return value
+
+        entry = await self._get_persistent(key)
+        if entry is not None:
+            value, remaining = entry
+            # Promote to memory for the rest of its lifetime
+            self.memory.set(key, value, remaining)
+            if remaining > 0:
+                counters["persistent_hits"] += 1
+                return value
+
+        counters["misses"] += 1
+        return None
+
+    async def get_stale(self, kind: str, key: str) -> Any | None:
+        """
+        Returns a value even if it has expired, as long as it is within the stale period
+        """
+
+        value = self.memory.get(key, allow_stale=True)
+        if value is None:
+            entry = await self._get_persistent(key)
+            if entry is not None:
+                value, remaining = entry
+                self.memory.set(key, value, remaining)
+
+        if value is not None:
+            self.counters[kind]["stale_hits"] += 1
+        return value
+
+    async def set(self, kind: str, key: str, value: Any) -> None:
+        """
+        Stores the value in memory and writes it to the persistent tier in the background
+        """
+
+        ttl = self.ttls[kind]
+        self.memory.set(key, value, ttl)
+
+        if self.store is not None:
+            task = asyncio.create_task(self._write(key, kind, value, ttl))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Removes a single key from both tiers
+        """
+
+        self.memory.delete(key)
+        if self.store is not None:
+            await self.store.delete(key)
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters and the current in-memory size
+        """
+
+        return {
+            "memory_entries": len(self.memory),
+            "max_memory_entries": self.memory.max_entries,
+            "persistent": self.store is not None,
+            "kinds": {kind: dict(counters) for kind, counters in self.counters.items()},
+        }
+
+    async def close(self) -> None:
+        """
+        Waits for pending persistent writes to finish
+        """
+
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def _get_persistent(self, key: str) -> tuple[Any, float] | None:
+        if self.store is None:
+            return None
+
+        try:
+            return await self.store.get(key)
+        except (SQLAlchemyError, OSError):
+            logger.warning("Persistent cache read failed for %s", key, exc_info=True)
+            return None
+
+    async def _write(self, key: str, kind: str, value: Any, ttl: float) -> None:
+        try:
+            await self.store.set(key, kind, value, ttl)
+        except (SQLAlchemyError, OSError):
+            logger.warning("Persistent cache write failed for %s", key, exc_info=True)
@@ -0,0 +1,61 @@
+import logging
+import re
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.catalog import CatalogWork, CatalogEdition, CatalogAuthor
+
+
+logger = logging.getLogger(__name__)
+
+# Open Library API paths that can be answered from the mirror
+MIRROR_PATH_RE = re.compile(r"^/(works|books|authors)/(OL\d+[WMA])\.json$")
+
+MIRROR_MODELS = {
+    "works": CatalogWork,
+    "books": CatalogEdition,
+    "authors": CatalogAuthor,
+}
+
+
+class CatalogMirror:
+    """
+    Read access to the local copy of the Open Library catalog
+    (filled by scripts/import_open_library_dump.py)
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, path: str) -> dict | None:
+        """
+        Returns the mirrored record for an API path like /works/OL45804W.json,
+        or None if the path is not mirrored or the record is missing
+        """
+
+        match = MIRROR_PATH_RE.match(path)
+        if match is None:
+            return None
+
+        collection, olid = match.groups()
+        model = MIRROR_MODELS[collection]
+
+        try:
+            async with self.session_maker() as session:
+                data = await session.scalar(select(model.data).where(model.key == olid))
+        except (SQLAlchemyError, OSError):
+            logger.warning("Catalog mirror lookup failed for %s", path, exc_info=True)
+            data = None
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,78 @@
+import time
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream errors.
+
+    - closed: requests go through, consecutive failures are counted
+    - open: requests are rejected until `reset_timeout` has passed
+    - half_open: a single probe request is let through to test recovery
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Returns True if a request may be sent upstream
+        """
+
+        state = self.state
+        if state == self.CLOSED:
+            return True
+
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        return False
+
+    def record_success(self) -> bool:
+        """
+        Closes the circuit and returns True if it was not closed before
+        """
+
+        recovered = self.opened_at is not None
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        return recovered
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+
+        # A failed probe reopens the circuit for another reset period
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """
+        Frees the probe slot when a probe ended without a result (e.g. it was cancelled)
+        """
+
+        self._probe_in_flight = False
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+        }
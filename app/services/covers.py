@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+from app.config import COVER_CACHE_DIR, COVER_CACHE_MAX_BYTES, COVER_THUMBNAIL_WORKERS
+
+
+COVERS_URL = "https://covers.openlibrary.org"
+
+# Max width of generated thumbnails; "L" is the original fetched from Open Library
+THUMBNAIL_WIDTHS = {"S": 90, "M": 180}
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Writes a file through a uniquely named temp file, so concurrent writers never share one.
+    The temp name starts with a dot and has a suffix, so the cache never loads it.
+    """
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def make_thumbnail(path: Path, width: int) -> bytes:
+    """
+    Scales an image down to `width` keeping its aspect ratio.
+    Runs in a worker thread.
+    """
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        image.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=85, optimize=True)
+    return output.getvalue()
+
+
+class CoverCache:
+    """
+    Content-addressed on-disk cache of cover images.
+
+    - Blobs are stored under their SHA-256, so the digest doubles as a strong ETag
+    - The index maps "<cover_id>-<size>" to a blob digest
+    - Least recently used blobs are evicted once the total size exceeds `max_bytes`
+    """
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            directory: str = COVER_CACHE_DIR,
+            max_bytes: int = COVER_CACHE_MAX_BYTES,
+            workers: int = COVER_THUMBNAIL_WORKERS,
+    ):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.blobs_dir = Path(directory) / "blobs"
+        self.index_dir = Path(directory) / "index"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        # Thread pool for thumbnail generation and blob writes
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="covers")
+
+        # digest -> size in bytes, least recently used first
+        self._blobs: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        # "<cover_id>-<size>" -> digest
+        self._index: dict[str, str] = {}
+        # Per-key fetch locks and the number of requests holding or waiting for each
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Restores the index and the LRU order (by modification time) from disk
+        """
+
+        blobs = sorted(
+            (path.stat().st_mtime, path.name, path.stat().st_size)
+            for path in self.blobs_dir.glob("*/*")
+            if not path.suffix
+        )
+        for _, digest, size in blobs:
+            self._blobs[digest] = size
+            self._total_bytes += size
+
+        for path in self.index_dir.iterdir():
+            if not path.name.startswith("."):
+                self._index[path.name] = path.read_text().strip()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    async def get(self, cover_id: int, size: str) -> tuple[Path, str] | None:
+        """
+        Returns the cached file and its digest, fetching or generating it on a miss.
+        Returns None if Open Library has no such cover; raises httpx.HTTPError on upstream errors.
+        """
+
+        key = f"{cover_id}-{size}"
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # One fetch per cover, concurrent requests wait for it
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                cached = self._lookup(key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+
+                self.misses += 1
+                data = await self._produce(cover_id, size)
+                if data is None:
+                    return None
+                return await self._store(key, data)
+        finally:
+            # The lock is dropped only when no request waits for it any more
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def _lookup(self, key: str) -> tuple[Path, str] | None:
+        digest = self._index.get(key)
+        if digest is None or digest not in self._blobs:
+            return None
+
+        path = self._blob_path(digest)
+        try:
+            # Persist the access for the LRU order after a restart
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(digest)
+            return None
+
+        self._blobs.move_to_end(digest)
+        return path, digest
+
+    async def _produce(self, cover_id: int, size: str) -> bytes | None:
+        if size not in THUMBNAIL_WIDTHS:
+            return await self._fetch(cover_id)
+
+        # Thumbnails are generated from the cached original
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            original = await self.get(cover_id, "L")
+            if original is None:
+                return None
+
+            path, digest = original
+            try:
+                return await loop.run_in_executor(self.executor, make_thumbnail, path, THUMBNAIL_WIDTHS[size])
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                # The original was evicted meanwhile: fetch it again
+                self._forget(digest)
+
+    async def _fetch(self, cover_id: int) -> bytes | None:
+        response = await self.client.get(
+            f"{COVERS_URL}/b/id/{cover_id}-L.jpg",
+            params={"default": "false"},
+            follow_redirects=True,
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        # Error pages and placeholders must not end up in the cache
+        if not response.headers.get("content-type", "").startswith("image/"):
+            raise httpx.DecodingError("Open Library returned a cover that is not an image", request=response.request)
+        return response.content
+
+    async def _store(self, key: str, data: bytes) -> tuple[Path, str]:
+        loop = asyncio.get_running_loop()
+        digest = await loop.run_in_executor(self.executor, self._write, key, data)
+
+        if digest not in self._blobs:
+            self._total_bytes += len(data)
+        self._blobs[digest] = len(data)
+        self._blobs.move_to_end(digest)
+        self._index[key] = digest
+
+        await self._evict()
+        return self._blob_path(digest), digest
+
+    def _write(self, key: str, data: bytes) -> str:
+        """
+        Writes the blob and its index entry atomically. Runs in a worker thread.
+        """
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            write_atomic(path, data)
+
+        write_atomic(self.index_dir / key, digest.encode())
+
+        return digest
+
+    async def _evict(self) -> None:
+        victims = []
+        while self._total_bytes > self.max_bytes and len(self._blobs) > 1:
+            digest, _ = next(iter(self._blobs.items()))
+            self._forget(digest)
+            victims.append(self._blob_path(digest))
+            self.evictions += 1
+
+        if victims:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._unlink, victims)
+
+    def _forget(self, digest: str) -> None:
+        # Index entries that point to the blob become misses and are rewritten on the next fetch
+        self._total_bytes -= self._blobs.pop(digest, 0)
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._blobs),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, delete, func, case, literal, Interval
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import (
+    ENRICHMENT_WORKERS,
+    ENRICHMENT_BATCH_SIZE,
+    ENRICHMENT_MAX_ATTEMPTS,
+    ENRICHMENT_RETRY_DELAY,
+    ENRICHMENT_POLL_INTERVAL,
+    ENRICHMENT_LEASE,
+)
+from app.models.enrichment_tasks import EnrichmentTask
+from app.services.books import BookRepository
+from app.services.open_library import OpenLibraryService
+from app.services.scheduler import request_priority, BULK
+
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentQueue:
+    """
+    Hydrates skeleton `books` rows from Open Library in the background.
+
+    - Endpoints insert a skeleton row and a task in their own transaction (`enqueue`)
+    - Tasks live in the enrichment_queue table, so they survive restarts
+    - Workers claim batches with FOR UPDATE SKIP LOCKED, which also works with several app processes
+    - Works Open Library does not know, and rows that cannot be stored, are retried with
+      exponential backoff up to `max_attempts`
+    - Works that could not be looked up because Open Library is unavailable are retried
+      after `retry_delay` without using up an attempt
+    - Enqueueing a failed task again revives it once a full backoff cycle has passed
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            service: OpenLibraryService,
+            workers: int = ENRICHMENT_WORKERS,
+            batch_size: int = ENRICHMENT_BATCH_SIZE,
+            max_attempts: int = ENRICHMENT_MAX_ATTEMPTS,
+            retry_delay: float = ENRICHMENT_RETRY_DELAY,
+            poll_interval: float = ENRICHMENT_POLL_INTERVAL,
+            lease: float = ENRICHMENT_LEASE,
+    ):
+        self.session_maker = session_maker
+        self.service = service
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.lease = lease
+
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+        # Counters since startup
+        self.hydrated = 0
+        self.retried = 0
+        self.postponed = 0
+
+    @staticmethod
+    async def enqueue(db: AsyncSession, work_olids: list[str]) -> None:
+        """
+        Inserts skeleton books rows and enrichment tasks for the given works.
+        Runs in the caller's transaction; call `notify` after the commit.
+        """
+
+        work_olids = list(dict.fromkeys(work_olids))
+        if not work_olids:
+            return
+
+        await BookRepository(db).insert_skeletons(work_olids)
+
+        # Failed tasks get a fresh set of attempts, at most once per full backoff cycle
+        revive_after = timedelta(seconds=ENRICHMENT_RETRY_DELAY * 2 ** ENRICHMENT_MAX_ATTEMPTS)
+        stmt = insert(EnrichmentTask).values([{"work_olid": work_olid} for work_olid in work_olids])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[EnrichmentTask.work_olid],
+                set_={
+                    "attempts": 0,
+                    "next_attempt_at": func.now(),
+                    "failed_at": None,
+                },
+                where=EnrichmentTask.failed_at < func.now() - revive_after,
+            )
+        )
+
+    def notify(self) -> None:
+        """
+        Wakes up idle workers after new tasks were committed
+        """
+
+        self._wakeup.set()
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def close(self) -> None:
+        """
+        Stops the workers; claimed tasks are picked up again after their lease expires
+        """
+
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        # Hydration yields to interactive and background Open Library requests
+        request_priority.set(BULK)
+
+        while True:
+            self._wakeup.clear()
+
+            try:
+                work_olids = await self._claim()
+                if work_olids:
+                    await self._process(work_olids)
+                    continue
+            except (SQLAlchemyError, OSError):
+                logger.warning("Enrichment batch failed", exc_info=True)
+            except Exception:
+                # Anything else must not end the worker; the batch is claimed again after its lease
+                logger.exception("Unexpected error in enrichment batch")
+
+            # Queue is empty (or the database is unavailable): wait for new tasks
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def _claim(self) -> list[str]:
+        """
+        Claims a batch of due tasks by moving their next attempt past the lease
+        """
+
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(EnrichmentTask.work_olid)
+                .where(
+                    EnrichmentTask.failed_at.is_(None),
+                    EnrichmentTask.next_attempt_at <= func.now(),
+                )
+                .order_by(EnrichmentTask.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            work_olids = list(result.scalars().all())
+
+            if work_olids:
+                await session.execute(
+                    update(EnrichmentTask)
+                    .where(EnrichmentTask.work_olid.in_(work_olids))
+                    .values(next_attempt_at=func.now() + timedelta(seconds=self.lease))
+                )
+            await session.commit()
+
+        return work_olids
+
+    async def _process(self, work_olids: list[str]) -> None:
+        """
+        Resolves a batch of works and hydrates their books rows in one transaction
+        """
+
+        fetched = await self.service.get_books_by_works(work_olids)
+        found = [book for book in fetched.values() if book]
+        # Works absent from `fetched` could not be looked up (Open Library unavailable)
+        missing = [work_olid for work_olid in work_olids if work_olid in fetched and fetched[work_olid] is None]
+        unavailable = [work_olid for work_olid in work_olids if work_olid not in fetched]
+
+        try:
+            async with self.session_maker() as session:
+                await self._hydrate(session, found)
+                await self._record_failure(session, missing, "Work could not be resolved from Open Library")
+                await self._postpone(session, unavailable)
+                await session.commit()
+        except SQLAlchemyError:
+            # One bad row (e.g. a title too long for the column) must not hold back the others
+            logger.warning("Enrichment batch could not be stored, retrying book by book", exc_info=True)
+            await self._process_one_by_one(found, missing, unavailable)
+            return
+
+        self.hydrated += len(found)
+        self.retried += len(missing)
+        self.postponed += len(unavailable)
+
+    async def _process_one_by_one(self, found: list[dict], missing: list[str], unavailable: list[str]) -> None:
+        async with self.session_maker() as session:
+            await self._record_failure(session, missing, "Work could not be resolved from Open Library")
+            await self._postpone(session, unavailable)
+            await session.commit()
+        self.retried += len(missing)
+        self.postponed += len(unavailable)
+
+        for book in found:
+            try:
+                async with self.session_maker() as session:
+                    await self._hydrate(session, [book])
+                    await session.commit()
+            except SQLAlchemyError as exc:
+                # Recorded in a separate transaction, so the failed attempt counts
+                async with self.session_maker() as session:
+                    await self._record_failure(session, [book["work_olid"]], f"Book could not be stored: {exc}")
+                    await session.commit()
+                self.retried += 1
+            else:
+                self.hydrated += 1
+
+    @staticmethod
+    async def _hydrate(session: AsyncSession, books: list[dict]) -> None:
+        if not books:
+            return
+
+        await BookRepository(session).upsert_many(books)
+        await session.execute(
+            delete(EnrichmentTask)
+            .where(EnrichmentTask.work_olid.in_([book["work_olid"] for book in books]))
+        )
+
+    async def _record_failure(self, session: AsyncSession, work_olids: list[str], error: str) -> None:
+        """
+        Uses up an attempt and schedules the next one with backoff
+        """
+
+        if not work_olids:
+            return
+
+        # Backoff doubles with every attempt: retry_delay * 2^attempts
+        backoff = literal(timedelta(seconds=self.retry_delay), Interval) * func.power(2, EnrichmentTask.attempts)
+        await session.execute(
+            update(EnrichmentTask)
+            .where(EnrichmentTask.work_olid.in_(work_olids))
+            .values(
+                attempts=EnrichmentTask.attempts + 1,
+                last_error=error,
+                next_attempt_at=func.now() + backoff,
+                failed_at=case(
+                    (EnrichmentTask.attempts + 1 >= self.max_attempts, func.now()),
+                    else_=None,
+                ),
+            )
+        )
+
+    async def _postpone(self, session: AsyncSession, work_olids: list[str]) -> None:
+        """
+        Schedules another attempt after an Open Library outage without using one up
+        """
+
+        if not work_olids:
+            return
+
+        await session.execute(
+            update(EnrichmentTask)
+            .where(EnrichmentTask.work_olid.in_(work_olids))
+            .values(
+                last_error="Open Library was unavailable",
+                next_attempt_at=func.now() + timedelta(seconds=self.retry_delay),
+            )
+        )
+
+    async def stats(self) -> dict:
+        """
+        Returns queue depth, lag of the oldest pending task and worker counters
+        """
+
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(
+                    func.count().filter(EnrichmentTask.failed_at.is_(None)),
+                    func.count().filter(EnrichmentTask.failed_at.is_not(None)),
+                    func.min(EnrichmentTask.enqueued_at).filter(EnrichmentTask.failed_at.is_(None)),
+                )
+            )
+            pending, failed, oldest = result.one()
+
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest is not None else 0
+
+        return {
+            "pending": pending,
+            "failed": failed,
+            "lag_seconds": round(lag, 1),
+            # Workers still running; a dead worker would show up here
+            "workers": sum(not task.done() for task in self._tasks),
+            "hydrated": self.hydrated,
+            "retried": self.retried,
+            "postponed": self.postponed,
+        }
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import httpx
+
+from app.config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_HTTP2,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_TIMEOUT,
+)
+
+
+class PoolMetrics:
+    """
+    Counters for connection pool checkouts
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "in_use": self.in_use,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Response stream that gives the connection slot back once the body is closed
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pooled transport and measures how long requests wait for a connection.
+
+    A semaphore sized like the pool makes checkout waits happen here,
+    where they can be timed, instead of inside the connection pool.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_connections: int):
+        self._transport = transport
+        self._slots = asyncio.Semaphore(max_connections)
+        self.metrics = PoolMetrics()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool_timeout = request.extensions.get("timeout", {}).get("pool")
+
+        started = time.perf_counter()
+        self.metrics.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=pool_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            raise httpx.PoolTimeout("Timed out waiting for a connection", request=request)
+        finally:
+            self.metrics.waiting -= 1
+
+        wait = time.perf_counter() - started
+        self.metrics.checkouts += 1
+        self.metrics.total_wait += wait
+        self.metrics.max_wait = max(self.metrics.max_wait, wait)
+        self.metrics.in_use += 1
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.metrics.in_use -= 1
+                self._slots.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(base_url: str) -> tuple[httpx.AsyncClient, InstrumentedTransport]:
+    """
+    Creates the app-wide outbound HTTP client with a shared connection pool.
+    The transport is returned as well, so its pool metrics can be read.
+    """
+
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        HTTP_READ_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+    transport = InstrumentedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=HTTP_HTTP2),
+        max_connections=HTTP_MAX_CONNECTIONS,
+    )
+
+    return httpx.AsyncClient(base_url=base_url, transport=transport, timeout=timeout), transport
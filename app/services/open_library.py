@@ -1,23 +1,413 @@
+import asyncio
 import httpx
 import re
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from functools import partial
+from typing import Any
+from urllib.parse import urlencode
 
-BASE_URL = "https://openlibrary.org"
+from app.config import (
+    OPEN_LIBRARY_FANOUT_CONCURRENCY,
+    OPEN_LIBRARY_FANOUT_DEADLINE,
+    OPEN_LIBRARY_BATCH_SIZE,
+    OPEN_LIBRARY_BREAKER_FAILURE_THRESHOLD,
+    OPEN_LIBRARY_BREAKER_RESET_TIMEOUT,
+    OPEN_LIBRARY_SEARCH_PREFETCH,
+)
+from app.services.authors import AuthorStore
+from app.services.cache import MetadataCache, LRUCache
+from app.services.catalog_mirror import CatalogMirror
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.scheduler import RequestScheduler, request_priority, BACKGROUND
+
+# Fields requested from search.json when resolving works in batches
+BATCH_SEARCH_FIELDS = "key,title,author_key,author_name,first_publish_year,cover_i,subject"
+
+WORK_OLID_RE = re.compile(r"^OL\d+W$")
+
+# Max number of entries served stale that are remembered for a refresh after recovery
+REFRESH_PENDING_MAX_ENTRIES = 1000
+
+# Cache keys served stale during the current request; set per request by the middleware in main.py
+stale_keys: ContextVar[set[str] | None] = ContextVar("stale_keys", default=None)
+
+
+class OpenLibraryUnavailable(Exception):
+    """
+    Raised when the circuit breaker is open and no cached data is available
+    """
+
+
+def normalize_search_value(value: str) -> str:
+    """
+    Trims, case-folds and collapses whitespace so equivalent filters share a cache entry
+    """
+
+    return " ".join(value.split()).casefold().replace('"', '\\"')
+
+
+def build_search_query(
+        title: str | None = None,
+        authors: str | None = None,
+        year: int | None = None,
+        subject: str | None = None,
+        isbn: str | None = None,
+        publisher: str | None = None,
+) -> str | None:
+    """
+    Builds a normalized Open Library search query from filters.
+    Returns None when no filter is provided.
+    """
+
+    q_parts = []
+    if authors and authors.strip():
+        q_parts.append(f'author:"{normalize_search_value(authors)}"')
+    if year:
+        q_parts.append(f'first_publish_year:{year}')
+    if isbn and isbn.strip():
+        q_parts.append(f'isbn:{"".join(isbn.split()).replace("-", "")}')
+    if publisher and publisher.strip():
+        q_parts.append(f'publisher:"{normalize_search_value(publisher)}"')
+    if subject and subject.strip():
+        q_parts.append(f'subject:"{normalize_search_value(subject)}"')
+    if title and title.strip():
+        q_parts.append(f'title:"{normalize_search_value(title)}"')
+
+    if not q_parts:
+        return None
+
+    # Parts are always joined in the same (alphabetical) order
+    return " AND ".join(q_parts)
+
+
+def is_upstream_failure(exc: httpx.HTTPError) -> bool:
+    """
+    Timeouts, connection errors, 5xx and 429 responses count as upstream failures
+    """
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code == 429
+    return isinstance(exc, httpx.RequestError)
+
+
+def cache_key(path: str, params: dict | None = None) -> str:
+    """
+    Builds a stable cache key from a request path and query parameters
+    """
+
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
 
 
 class OpenLibraryService:
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            cache: MetadataCache | None = None,
+            fanout_concurrency: int = OPEN_LIBRARY_FANOUT_CONCURRENCY,
+            fanout_deadline: float = OPEN_LIBRARY_FANOUT_DEADLINE,
+            batch_size: int = OPEN_LIBRARY_BATCH_SIZE,
+            breaker: CircuitBreaker | None = None,
+            search_prefetch: bool = OPEN_LIBRARY_SEARCH_PREFETCH,
+            mirror: CatalogMirror | None = None,
+            authors: AuthorStore | None = None,
+            scheduler: RequestScheduler | None = None,
+    ):
         self.client = client
+        self.cache = cache
+        self.mirror = mirror
+        self.authors = authors
+        self.fanout_concurrency = fanout_concurrency
+        self.fanout_deadline = fanout_deadline
+        self.batch_size = batch_size
+        self.search_prefetch = search_prefetch
+
+        # Rate limit and priority order of upstream requests
+        self.scheduler = scheduler or RequestScheduler()
+
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=OPEN_LIBRARY_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=OPEN_LIBRARY_BREAKER_RESET_TIMEOUT,
+        )
+
+        # Upstream requests currently in flight, keyed by cache key
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.coalesced_requests = 0
+
+        # Entries served stale while upstream was down, refreshed once it recovers
+        self._refresh_pending = LRUCache(REFRESH_PENDING_MAX_ENTRIES)
+        self._background: set[asyncio.Task] = set()
+
+    async def _get_json(self, kind: str, path: str, params: dict | None = None) -> dict:
+        """
+        Fetches a JSON document from Open Library, going through the metadata cache.
+        Raises httpx.HTTPError when the upstream request fails,
+        or OpenLibraryUnavailable when the circuit is open and nothing is cached.
+        """
+
+        key = cache_key(path, params)
+
+        # Local-first mode: answer from the catalog mirror when the record is there
+        if self.mirror is not None and params is None:
+            mirrored = await self.mirror.get(path)
+            if mirrored is not None:
+                return mirrored
+
+        if self.cache is not None:
+            cached = await self.cache.get(kind, key)
+            if cached is not None:
+                return cached
+
+        # Single-flight: concurrent callers for the same URL share one upstream request.
+        # The request runs with the priority of the caller that started it; a higher-priority
+        # caller joining it moves it up in the scheduler queue.
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_requests += 1
+            self.scheduler.promote(key)
+        elif self.breaker.allow_request():
+            task = self._start_fetch(kind, key, path, params)
+        else:
+            # Open Library is down: serve stale data and refresh it once it recovers
+            return await self._get_stale(
+                kind, key, OpenLibraryUnavailable("Open Library is unavailable"), (path, params),
+            )
+
+        try:
+            # Shield so that one cancelled caller does not cancel the request for the others
+            return await asyncio.shield(task)
+        except httpx.HTTPError as exc:
+            if not is_upstream_failure(exc):
+                raise
+            refresh = (path, params) if self.breaker.state != CircuitBreaker.CLOSED else None
+            return await self._get_stale(kind, key, exc, refresh)
+
+    def _start_fetch(self, kind: str, key: str, path: str, params: dict | None) -> asyncio.Task:
+        task = asyncio.create_task(self._fetch_json(kind, key, path, params))
+        self._inflight[key] = task
+        task.add_done_callback(partial(self._forget_inflight, key))
+        return task
+
+    async def _fetch_json(self, kind: str, key: str, path: str, params: dict | None) -> dict:
+        """
+        Performs the upstream request and stores the result in the cache
+        """
+
+        try:
+            await self.scheduler.acquire(key=key)
+            response = await self.client.get(path, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as exc:
+            if is_upstream_failure(exc):
+                self.breaker.record_failure()
+            else:
+                # Client errors such as 404 still mean that upstream is healthy
+                self._record_success()
+            raise
+        except ValueError as exc:
+            # A 200 with a body that is not JSON (e.g. an HTML maintenance page) is an upstream failure
+            self.breaker.record_failure()
+            raise httpx.DecodingError("Open Library returned an invalid JSON body", request=response.request) from exc
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+
+        self._record_success()
+
+        if self.cache is not None:
+            await self.cache.set(kind, key, data)
+
+        return data
+
+    def _forget_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _get_stale(
+            self,
+            kind: str,
+            key: str,
+            exc: Exception,
+            refresh: tuple[str, dict | None] | None = None,
+    ) -> dict:
+        """
+        Returns an expired cached value and flags the current response as stale.
+        With `refresh` (path, params) the entry is re-fetched once upstream recovers.
+        Re-raises `exc` when nothing is cached.
+        """
+
+        if self.cache is not None:
+            stale = await self.cache.get_stale(kind, key)
+            if stale is not None:
+                served = stale_keys.get()
+                if served is not None:
+                    served.add(key)
+                if refresh is not None:
+                    # Bounded: during a long outage only the most recently served entries are kept
+                    self._refresh_pending.set(key, (kind, *refresh), float("inf"))
+                return stale
+
+        raise exc
+
+    def _record_success(self) -> None:
+        if self.breaker.record_success() and self._refresh_pending:
+            # Upstream recovered: refresh everything that was served stale
+            pending = dict(self._refresh_pending.items())
+            self._refresh_pending = LRUCache(REFRESH_PENDING_MAX_ENTRIES)
+            task = asyncio.create_task(self._refresh(pending))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _refresh(self, pending: dict[str, tuple[str, str, dict | None]]) -> None:
+        """
+        Re-fetches entries that were served stale, with bounded concurrency
+        """
+
+        request_priority.set(BACKGROUND)
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+
+        async def refresh_one(key: str, kind: str, path: str, params: dict | None) -> None:
+            async with semaphore:
+                task = self._inflight.get(key) or self._start_fetch(kind, key, path, params)
+                await asyncio.shield(task)
+
+        await asyncio.gather(
+            *(refresh_one(key, *entry) for key, entry in pending.items()),
+            return_exceptions=True,
+        )
+
+    async def close(self) -> None:
+        """
+        Cancels background refreshes
+        """
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def _gather_limited(
+            self,
+            fetches: list[Callable[[], Awaitable[Any]]],
+            failed: Any = None,
+    ) -> list[Any]:
+        """
+        Runs sub-requests concurrently with a bounded concurrency limit and an overall deadline.
+        Results keep the order of `fetches`; failed or unfinished sub-requests become `failed`.
+        """
+
+        if not fetches:
+            return []
+
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+
+        async def run(fetch: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await fetch()
+
+        tasks = [asyncio.create_task(run(fetch)) for fetch in fetches]
+        try:
+            await asyncio.wait(tasks, timeout=self.fanout_deadline)
+        finally:
+            # Sub-requests that missed the deadline are treated as failed
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(failed)
+                continue
+
+            exc = task.exception()
+            if exc is None:
+                results.append(task.result())
+            elif isinstance(exc, (httpx.HTTPError, OpenLibraryUnavailable)):
+                results.append(failed)
+            else:
+                raise exc
+
+        return results
 
     async def search_books(self, query: str, limit: int = 10, offset: int = 0):
         """
         Performs a book search in Open Library using the constructed search query
         """
-        response = await self.client.get(
+        return await self._get_json(
+            "search",
             "/search.json",
             params={"q": query, "limit": limit, "offset": offset}
         )
-        response.raise_for_status()
-        return response.json()
+
+
+    async def search_page(self, query: str, page: int, page_size: int) -> dict:
+        """
+        Returns one page of search results and prefetches the next page in the background
+        """
+
+        offset = (page - 1) * page_size
+        results = await self.search_books(query=query, limit=page_size, offset=offset)
+
+        next_offset = offset + page_size
+        if (
+                self.search_prefetch
+                and next_offset < results.get("numFound", 0)
+                and self.breaker.state == CircuitBreaker.CLOSED
+        ):
+            task = asyncio.create_task(self._prefetch_search(query, page_size, next_offset))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        return results
+
+    async def _prefetch_search(self, query: str, limit: int, offset: int) -> None:
+        # Prefetched data is not part of the response that triggered it
+        stale_keys.set(None)
+        request_priority.set(BACKGROUND)
+        try:
+            await self.search_books(query=query, limit=limit, offset=offset)
+        except (httpx.HTTPError, OpenLibraryUnavailable):
+            pass
+
+    async def _get_authors(self, author_keys: list[str]) -> dict[str, str]:
+        """
+        Resolves author keys like /authors/OL23919A to names, keyed by author OLID.
+        Checks the local authors table first and saves names fetched from Open Library.
+        Authors that cannot be resolved are left out.
+        """
+
+        olids = list(dict.fromkeys(key.split("/")[-1] for key in author_keys))
+        if not olids:
+            return {}
+
+        names = await self.authors.get_many(olids) if self.authors is not None else {}
+
+        missing = [olid for olid in olids if olid not in names]
+        results = await self._gather_limited(
+            [partial(self._get_json, "author", f"/authors/{olid}.json") for olid in missing]
+        )
+        fetched = {
+            olid: author["name"]
+            for olid, author in zip(missing, results)
+            if author is not None and author.get("name")
+        }
+
+        if fetched and self.authors is not None:
+            await self.authors.save_many(fetched)
+
+        names.update(fetched)
+        return {olid: names[olid] for olid in olids if olid in names}
 
 
     async def get_book_by_edition(self, edition_id: str) -> dict | None:
@@ -27,9 +417,7 @@ class OpenLibraryService:
 
         # Get edition
         try:
-            edition_resp = await self.client.get(f"/books/{edition_id}.json")
-            edition_resp.raise_for_status()
-            edition = edition_resp.json()
+            edition = await self._get_json("edition", f"/books/{edition_id}.json")
         except httpx.HTTPError:
             return None
 
@@ -68,47 +456,40 @@ class OpenLibraryService:
         description = None
         subjects = []
 
+        work_key = None
         works = edition.get("works")
         if works:
             work_key = works[0].get("key")
             if work_key:
                 work_olid = work_key.split("/")[-1]
 
-                try:
-                    work_resp = await self.client.get(f"{work_key}.json")
-                    work_resp.raise_for_status()
-                    work = work_resp.json()
+        author_keys = [a["key"] for a in edition.get("authors", []) if a.get("key")]
 
-                    description = work.get("description")
-                    if isinstance(description, dict):
-                        description = description.get("value")
+        # Fetch the work and all authors concurrently
+        fetches = [partial(self._get_authors, author_keys)]
+        if work_key:
+            fetches.append(partial(self._get_json, "work", f"{work_key}.json"))
 
-                    subjects = work.get("subjects") or []
-                except httpx.HTTPError:
-                    pass
+        results = await self._gather_limited(fetches)
 
-        # Authors
-        authors: list[str] = []
+        if work_key:
+            work = results.pop()
+            if work is not None:
+                description = work.get("description")
+                if isinstance(description, dict):
+                    description = description.get("value")
 
-        for a in edition.get("authors", []):
-            author_key = a.get("key")
-            if not author_key:
-                continue
+                subjects = work.get("subjects") or []
 
-            try:
-                author_resp = await self.client.get(f"{author_key}.json")
-                author_resp.raise_for_status()
-                author = author_resp.json()
-                if "name" in author:
-                    authors.append(author["name"])
-            except httpx.HTTPError:
-                continue
+        # Authors
+        authors = results[0] or {}
 
         # Return normalized dict
         return {
             "work_olid": work_olid,
             "title": title,
-            "authors": authors or None,
+            "authors": list(authors.values()) or None,
+            "author_keys": list(authors) or None,
             "description": description,
             "language": languages or None,
             "year": year,
@@ -126,27 +507,36 @@ class OpenLibraryService:
         """
 
         try:
-            resp = await self.client.get(f"/works/{work_id}.json")
-            resp.raise_for_status()
-            work = resp.json()
+            return await self._get_work_book(work_id)
         except httpx.HTTPError:
             return None
 
+    async def _resolve_work(self, work_id: str) -> dict | None:
+        """
+        Same as get_book_by_work, but only a work unknown to Open Library maps to None;
+        upstream failures are raised
+        """
+
+        try:
+            return await self._get_work_book(work_id)
+        except httpx.HTTPStatusError as exc:
+            if is_upstream_failure(exc):
+                raise
+            return None
+
+    async def _get_work_book(self, work_id: str) -> dict:
+        work = await self._get_json("work", f"/works/{work_id}.json")
+
         # Title
         title = work.get("title")
 
-        # Authors
-        authors = []
-        for a in work.get("authors", []):
-            author_key = a.get("author", {}).get("key")
-            if author_key:
-                try:
-                    author_resp = await self.client.get(f"{author_key}.json")
-                    author_resp.raise_for_status()
-                    author = author_resp.json()
-                    authors.append(author.get("name"))
-                except httpx.HTTPError:
-                    continue
+        # Authors (local authors table first, the rest fetched concurrently)
+        author_keys = [
+            a.get("author", {}).get("key")
+            for a in work.get("authors", [])
+            if a.get("author", {}).get("key")
+        ]
+        authors = await self._get_authors(author_keys)
 
         # Publication year
         year = work.get("first_publish_date")
@@ -166,7 +556,94 @@ class OpenLibraryService:
         return {
             "work_olid": work_id,
             "title": title,
-            "authors": authors or None,
+            "authors": list(authors.values()) or None,
+            "author_keys": list(authors) or None,
             "year": year,
             "cover_url": cover_url,
-        }
\ No newline at end of file
+            "subject": work.get("subjects") or None,
+        }
+
+
+    async def get_books_by_works(self, work_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Returns short information about many books at once, keyed by work OLID.
+
+        - Works are resolved in chunks with one search query per chunk
+        - Works missing from search results are fetched one by one in parallel
+        - Works unknown to Open Library map to None
+        - Works that could not be looked up (upstream failure, open circuit, deadline) are left out,
+          so callers can tell an outage from a missing work and retry them later
+        """
+
+        unique_ids = list(dict.fromkeys(work_ids))
+        books: dict[str, dict | None] = {}
+
+        # Only well-formed OLIDs can be put into a search query
+        searchable = [work_id for work_id in unique_ids if WORK_OLID_RE.match(work_id)]
+        chunks = [
+            searchable[i:i + self.batch_size]
+            for i in range(0, len(searchable), self.batch_size)
+        ]
+
+        results = await self._gather_limited(
+            [partial(self._search_works, chunk) for chunk in chunks]
+        )
+        for found in results:
+            if found:
+                books.update(found)
+
+        # Fallback for works that search did not return
+        missing = [work_id for work_id in unique_ids if work_id not in books]
+        unresolved = object()
+        fallback = await self._gather_limited(
+            [partial(self._resolve_work, work_id) for work_id in missing],
+            failed=unresolved,
+        )
+        for work_id, book in zip(missing, fallback):
+            if book is not unresolved:
+                books[work_id] = book
+
+        return books
+
+    async def _search_works(self, work_ids: list[str]) -> dict[str, dict]:
+        """
+        Resolves a chunk of work OLIDs with a single search.json request
+        """
+
+        keys = " OR ".join(f"/works/{work_id}" for work_id in work_ids)
+        results = await self._get_json(
+            "search",
+            "/search.json",
+            params={"q": f"key:({keys})", "fields": BATCH_SEARCH_FIELDS, "limit": len(work_ids)}
+        )
+
+        books = {}
+        author_names = {}
+        for doc in results.get("docs", []):
+            work_id = doc.get("key", "").split("/")[-1]
+            if work_id not in work_ids:
+                continue
+
+            cover_url = None
+            if doc.get("cover_i"):
+                cover_url = f"https://covers.openlibrary.org/b/id/{doc['cover_i']}-L.jpg"
+
+            # author_key and author_name are parallel lists
+            author_keys = doc.get("author_key") or []
+            authors = doc.get("author_name") or []
+            author_names.update(zip(author_keys, authors))
+
+            books[work_id] = {
+                "work_olid": work_id,
+                "title": doc.get("title"),
+                "authors": authors or None,
+                "author_keys": author_keys or None,
+                "year": doc.get("first_publish_year"),
+                "cover_url": cover_url,
+                "subject": doc.get("subject") or None,
+            }
+
+        if self.authors is not None:
+            await self.authors.save_many(author_names)
+
+        return books
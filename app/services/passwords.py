@@ -0,0 +1,76 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.services.scheduler import WaitStats
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a dedicated thread pool.
+
+    - bcrypt releases the GIL, so hashes run in parallel without blocking the event loop
+    - At most `workers` hashes run at once; further calls queue for a worker
+    - Queue wait and hashing time are recorded for the admin stats
+    """
+
+    def __init__(self, context: CryptContext, workers: int):
+        self.context = context
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+        self.wait = WaitStats()
+        self.hashing_time = 0.0
+        self.rehashed = 0
+
+    async def _run(self, func, *args):
+        queued = time.perf_counter()
+        started = 0.0
+
+        def call():
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args)
+
+        self.wait.waiting += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            self.wait.waiting -= 1
+
+        self.wait.record(started - queued)
+        self.hashing_time += time.perf_counter() - started
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verifies a password and returns a new hash if the stored one uses outdated settings
+        """
+
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        stats = self.wait.as_dict()
+        return {
+            "workers": self.workers,
+            "in_flight": stats["waiting"],
+            "hashes": stats["requests"],
+            "avg_wait_ms": stats["avg_wait_ms"],
+            "max_wait_ms": stats["max_wait_ms"],
+            "avg_hash_ms": round(self.hashing_time / stats["requests"] * 1000, 3) if stats["requests"] else 0.0,
+            "rehashed": self.rehashed,
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
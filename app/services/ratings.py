@@ -0,0 +1,172 @@
+from sqlalchemy import select, update, delete, func, or_, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book_rating_stats import BookRatingStats as BookRatingStatsModel
+from app.models.reviews import Review as ReviewModel
+
+
+STARS = (1, 2, 3, 4, 5)
+
+# Float sums drift by rounding errors; smaller differences are not reconciled
+SUM_TOLERANCE = 1e-6
+
+
+def star_column(rating: float) -> str:
+    """
+    Histogram column of a rating (whole stars)
+    """
+
+    return f"stars_{min(max(int(rating), 1), 5)}"
+
+
+async def apply_rating_change(
+        db: AsyncSession,
+        work_olid: str,
+        old: float | None = None,
+        new: float | None = None,
+) -> None:
+    """
+    Updates the book's aggregates for a created (`new`), edited (`old` and `new`) or deleted (`old`) review.
+    Runs in the caller's transaction; the row lock serializes concurrent reviews of the same book.
+    """
+
+    if old == new:
+        return
+
+    stars = {name: 0 for name in map(star_column, STARS)}
+    if old is not None:
+        stars[star_column(old)] -= 1
+    if new is not None:
+        stars[star_column(new)] += 1
+
+    count_delta = (new is not None) - (old is not None)
+    sum_delta = (new or 0) - (old or 0)
+
+    changes = {
+        "review_count": BookRatingStatsModel.review_count + count_delta,
+        "rating_sum": BookRatingStatsModel.rating_sum + sum_delta,
+        **{name: getattr(BookRatingStatsModel, name) + delta for name, delta in stars.items() if delta},
+        "updated_at": func.now(),
+    }
+
+    if old is None:
+        # First review of a book creates its row
+        stmt = insert(BookRatingStatsModel).values(
+            work_olid=work_olid,
+            review_count=1,
+            rating_sum=new,
+            **{name: max(delta, 0) for name, delta in stars.items()},
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(index_elements=[BookRatingStatsModel.work_olid], set_=changes)
+        )
+    else:
+        await db.execute(
+            update(BookRatingStatsModel)
+            .where(BookRatingStatsModel.work_olid == work_olid)
+            .values(changes)
+        )
+
+
+async def subtract_user_reviews(db: AsyncSession, user_id: int) -> None:
+    """
+    Removes a user's reviews from the aggregates before the user (and the reviews by cascade) is deleted.
+    Runs in the caller's transaction.
+    """
+
+    removed = (
+        select(
+            ReviewModel.work_olid,
+            func.count().label("review_count"),
+            func.sum(ReviewModel.rating).label("rating_sum"),
+            *[
+                func.count().filter(func.floor(ReviewModel.rating) == star).label(f"stars_{star}")
+                for star in STARS
+            ],
+        )
+        .where(ReviewModel.user_id == user_id)
+        .group_by(ReviewModel.work_olid)
+        .subquery()
+    )
+
+    await db.execute(
+        update(BookRatingStatsModel)
+        .where(BookRatingStatsModel.work_olid == removed.c.work_olid)
+        .values(
+            review_count=BookRatingStatsModel.review_count - removed.c.review_count,
+            rating_sum=BookRatingStatsModel.rating_sum - removed.c.rating_sum,
+            **{
+                f"stars_{star}": getattr(BookRatingStatsModel, f"stars_{star}") - removed.c[f"stars_{star}"]
+                for star in STARS
+            },
+            updated_at=func.now(),
+        )
+    )
+
+
+async def get_rating_summary(db: AsyncSession, work_olid: str) -> dict:
+    """
+    Returns the review count, average rating and star histogram of a book with one primary key lookup
+    """
+
+    stats = await db.get(BookRatingStatsModel, work_olid)
+    count = stats.review_count if stats else 0
+
+    return {
+        "review_count": count,
+        "avg_rating": round(stats.rating_sum / count, 2) if count else None,
+        "histogram": {star: getattr(stats, f"stars_{star}") if stats else 0 for star in STARS},
+    }
+
+
+async def reconcile_rating_stats(db: AsyncSession) -> dict:
+    """
+    Recomputes the aggregates of all books from the reviews table and fixes rows that drifted.
+    Commits the changes.
+    """
+
+    fresh = (
+        select(
+            ReviewModel.work_olid,
+            func.count(),
+            func.sum(ReviewModel.rating),
+            *[func.count().filter(func.floor(ReviewModel.rating) == star) for star in STARS],
+        )
+        .group_by(ReviewModel.work_olid)
+    )
+
+    columns = ["work_olid", "review_count", "rating_sum", *[f"stars_{star}" for star in STARS]]
+    stmt = insert(BookRatingStatsModel).from_select(columns, fresh)
+    stored = BookRatingStatsModel
+
+    # Only rows that differ from the recomputed values are rewritten
+    drifted = or_(
+        stored.review_count != stmt.excluded.review_count,
+        func.abs(stored.rating_sum - stmt.excluded.rating_sum) > SUM_TOLERANCE,
+        *[getattr(stored, f"stars_{star}") != stmt.excluded[f"stars_{star}"] for star in STARS],
+    )
+
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[stored.work_olid],
+            set_={
+                **{column: stmt.excluded[column] for column in columns[1:]},
+                "updated_at": func.now(),
+            },
+            where=drifted,
+        ).returning(stored.work_olid)
+    )
+    fixed = len(result.all())
+
+    # Books whose reviews are all gone
+    result = await db.execute(
+        delete(stored)
+        .where(~exists().where(ReviewModel.work_olid == stored.work_olid))
+        .returning(stored.work_olid)
+    )
+    removed = len(result.all())
+
+    await db.commit()
+
+    return {"fixed": fixed, "removed": removed}
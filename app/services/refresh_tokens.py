@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import REFRESH_TOKEN_SWEEP_INTERVAL, REFRESH_TOKEN_SWEEP_BATCH_SIZE
+from app.models.refresh_tokens import RefreshToken as RefreshTokenModel
+from app.models.users import User as UserModel
+
+
+logger = logging.getLogger(__name__)
+
+
+async def store_refresh_token(
+        db: AsyncSession,
+        jti: uuid.UUID,
+        user_id: int,
+        expires_at: datetime,
+        parent: Row | None = None,
+) -> None:
+    """
+    Records an issued refresh token. Rotated tokens (`parent`) stay in their parent's family,
+    tokens issued at login start a new one.
+    """
+
+    db.add(RefreshTokenModel(
+        jti=jti,
+        family_id=parent.family_id if parent is not None else jti,
+        parent_jti=parent.jti if parent is not None else None,
+        user_id=user_id,
+        expires_at=expires_at,
+    ))
+
+
+async def rotate_refresh_token(db: AsyncSession, jti: uuid.UUID) -> Row | None:
+    """
+    Marks a refresh token as used and returns it with the claims of its active user.
+    Returns None if the token is unknown, expired, revoked, already used or its user was deactivated.
+
+    One UPDATE by primary key: concurrent refreshes with the same token cannot both succeed.
+    """
+
+    result = await db.execute(
+        update(RefreshTokenModel)
+        .where(
+            RefreshTokenModel.jti == jti,
+            RefreshTokenModel.used_at.is_(None),
+            RefreshTokenModel.revoked_at.is_(None),
+            RefreshTokenModel.expires_at > func.now(),
+            UserModel.id == RefreshTokenModel.user_id,
+            UserModel.is_active == True,
+        )
+        .values(used_at=func.now())
+        .returning(
+            RefreshTokenModel.jti,
+            RefreshTokenModel.family_id,
+            UserModel.id,
+            UserModel.email,
+            UserModel.role,
+            UserModel.token_version,
+        )
+    )
+    return result.first()
+
+
+async def revoke_reused_family(db: AsyncSession, jti: uuid.UUID) -> bool:
+    """
+    Revokes the whole family if `jti` was already exchanged: a used token presented again
+    means it leaked, and the descendants may be held by the attacker.
+    """
+
+    family_id = await db.scalar(
+        select(RefreshTokenModel.family_id)
+        .where(RefreshTokenModel.jti == jti, RefreshTokenModel.used_at.is_not(None))
+    )
+    if family_id is None:
+        return False
+
+    await db.execute(
+        update(RefreshTokenModel)
+        .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+    return True
+
+
+async def revoke_family(db: AsyncSession, jti: uuid.UUID) -> None:
+    """
+    Revokes a refresh token together with every token rotated from the same login
+    """
+
+    family_id = select(RefreshTokenModel.family_id).where(RefreshTokenModel.jti == jti).scalar_subquery()
+    await db.execute(
+        update(RefreshTokenModel)
+        .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: int) -> None:
+    """
+    Revokes every refresh token of a user. Runs in the caller's transaction.
+    """
+
+    await db.execute(
+        update(RefreshTokenModel)
+        .where(RefreshTokenModel.user_id == user_id, RefreshTokenModel.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+
+
+class RefreshTokenSweeper:
+    """
+    Deletes expired refresh tokens in the background.
+
+    - Used and revoked tokens are kept until they expire, so reuse is still detected
+    - Rows are deleted in batches of `batch_size`, one short transaction each, so the sweep
+      never holds many row locks or blocks refreshes for long
+    - SKIP LOCKED lets several app processes sweep at the same time
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            interval: float = REFRESH_TOKEN_SWEEP_INTERVAL,
+            batch_size: int = REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+    ):
+        self.session_maker = session_maker
+        self.interval = interval
+        self.batch_size = batch_size
+        self._sweeper: asyncio.Task | None = None
+
+        self.sweeps = 0
+        self.deleted = 0
+
+    async def sweep(self) -> int:
+        expired = (
+            select(RefreshTokenModel.jti)
+            .where(RefreshTokenModel.expires_at < func.now())
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        deleted = 0
+        while True:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    delete(RefreshTokenModel).where(RefreshTokenModel.jti.in_(expired.scalar_subquery()))
+                )
+                await db.commit()
+
+            deleted += result.rowcount
+            if result.rowcount < self.batch_size:
+                break
+
+        self.sweeps += 1
+        self.deleted += deleted
+        return deleted
+
+    def start(self) -> None:
+        self._sweeper = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except (OSError, SQLAlchemyError):
+                logger.warning("Refresh token sweep failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "sweeps": self.sweeps,
+            "deleted": self.deleted,
+        }
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable
+from contextvars import ContextVar
+from typing import TypeVar
+
+from app.config import OPEN_LIBRARY_RATE_LIMIT, OPEN_LIBRARY_RATE_BURST
+
+
+T = TypeVar("T")
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BACKGROUND, BULK)
+
+# Priority of outbound requests made by the current task; background tasks set it on start
+request_priority: ContextVar[str] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+async def run_with_priority(priority: str, awaitable: Awaitable[T]) -> T:
+    """
+    Awaits `awaitable` in a task of its own at `priority`; the caller's priority is unchanged
+    """
+
+    async def run() -> T:
+        request_priority.set(priority)
+        return await awaitable
+
+    return await asyncio.create_task(run())
+
+
+class WaitStats:
+    """
+    Queue-wait counters of one priority class
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "waiting": self.waiting,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 3) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class RequestScheduler:
+    """
+    Global token bucket for outbound requests with strict priority between classes.
+
+    - Tokens refill at `rate` per second up to `burst`
+    - Waiting requests are served interactive first, then background, then bulk;
+      FIFO within a class
+    - A request queued under a `key` can be moved to a higher class while it waits (`promote`)
+    - rate <= 0 disables limiting (waits are still counted)
+    """
+
+    def __init__(self, rate: float = OPEN_LIBRARY_RATE_LIMIT, burst: int = OPEN_LIBRARY_RATE_BURST):
+        self.rate = rate
+        self.burst = max(burst, 1)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters: dict[str, deque[asyncio.Future]] = {name: deque() for name in PRIORITIES}
+        self._timer: asyncio.TimerHandle | None = None
+        # Waiting requests that can be promoted, by key: (future, current priority)
+        self._queued: dict[str, tuple[asyncio.Future, str]] = {}
+
+        self.stats = {name: WaitStats() for name in PRIORITIES}
+
+    async def acquire(self, priority: str | None = None, key: str | None = None) -> None:
+        """
+        Waits until a request of the given (or the current task's) priority may be sent
+        """
+
+        priority = priority or request_priority.get()
+
+        if self.rate <= 0:
+            self.stats[priority].record(0.0)
+            return
+
+        # Fast path: nobody is queued and a token is available
+        self._refill()
+        if self._tokens >= 1 and not any(self._waiters.values()):
+            self._tokens -= 1
+            self.stats[priority].record(0.0)
+            return
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        self.stats[priority].waiting += 1
+        if key is not None:
+            self._queued[key] = (future, priority)
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was granted after the caller gave up: hand it to the next waiter
+                self._tokens = min(self._tokens + 1, self.burst)
+                self._dispatch()
+            raise
+        finally:
+            # The request may have been promoted while it waited
+            if key is not None and self._queued.get(key, (None,))[0] is future:
+                priority = self._queued.pop(key)[1]
+            self.stats[priority].waiting -= 1
+
+        self.stats[priority].record(time.perf_counter() - started)
+
+    def promote(self, key: str, priority: str | None = None) -> None:
+        """
+        Moves a waiting request to the given (or the current task's) priority class if that is higher,
+        e.g. when an interactive caller joins a bulk request for the same URL
+        """
+
+        priority = priority or request_priority.get()
+        queued = self._queued.get(key)
+        if queued is None:
+            return
+
+        future, current = queued
+        if future.done() or PRIORITIES.index(priority) >= PRIORITIES.index(current):
+            return
+
+        self._waiters[current].remove(future)
+        self._waiters[priority].append(future)
+        self.stats[current].waiting -= 1
+        self.stats[priority].waiting += 1
+        self._queued[key] = (future, priority)
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """
+        Hands out available tokens by priority and schedules the next refill if requests remain
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+
+        for name in PRIORITIES:
+            queue = self._waiters[name]
+            while queue and self._tokens >= 1:
+                future = queue.popleft()
+                if future.done():
+                    # Cancelled while waiting
+                    continue
+                self._tokens -= 1
+                future.set_result(None)
+
+        if any(self._waiters.values()):
+            delay = (1 - self._tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def as_dict(self) -> dict:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "classes": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
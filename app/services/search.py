@@ -0,0 +1,206 @@
+import re
+from abc import ABC, abstractmethod
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.books import Book as BookModel
+from app.services.authors import get_book_authors
+from app.services.open_library import OpenLibraryService, build_search_query
+
+
+# Words usable as tsquery lexemes
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def doc_to_item(doc: dict) -> dict:
+    """
+    Converts an Open Library search document into a search result item
+    """
+
+    # Normalize authors list
+    authors_list = []
+    for a in doc.get("author_name", []):
+        if isinstance(a, str):
+            authors_list.append(a)
+        elif isinstance(a, dict) and "name" in a:
+            authors_list.append(a["name"])
+
+    # Build cover image URL if available
+    cover_url = f"https://covers.openlibrary.org/b/id/{doc['cover_i']}-M.jpg" if doc.get("cover_i") else None
+
+    return {
+        "work_olid": doc.get("key", "").split("/")[-1],
+        "title": doc.get("title"),
+        "authors": authors_list or None,
+        "year": doc.get("first_publish_year"),
+        "cover_url": cover_url,
+    }
+
+
+class SearchBackend(ABC):
+    """
+    Base class for book search backends.
+
+    `filters` holds the /books/search filters: title, authors, year, subject, isbn, publisher.
+    `search` returns {"items": [...], "total": int}.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def search(self, filters: dict, page: int, page_size: int) -> dict:
+        ...
+
+
+class OpenLibrarySearchBackend(SearchBackend):
+    """
+    Proxies searches to Open Library search.json
+    """
+
+    name = "open_library"
+
+    def __init__(self, service: OpenLibraryService):
+        self.service = service
+
+    async def search(self, filters: dict, page: int, page_size: int) -> dict:
+        q = build_search_query(**filters)
+        if q is None:
+            return {"items": [], "total": 0}
+
+        results = await self.service.search_page(query=q, page=page, page_size=page_size)
+
+        return {
+            "items": [doc_to_item(doc) for doc in results.get("docs", [])],
+            "total": results.get("numFound", 0),
+        }
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    Full-text search over the local books table (tsvector + GIN index).
+
+    - title, authors and subject match the weighted parts of `books.search_vector`
+    - results are ranked by relevance
+    - filters the table cannot answer (isbn, publisher) and empty results go to `fallback`
+    """
+
+    name = "local"
+
+    # Filter -> tsvector weight of the matching column
+    FIELD_WEIGHTS = {"title": "A", "authors": "B", "subject": "C"}
+
+    UNSUPPORTED_FILTERS = ("isbn", "publisher")
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            fallback: SearchBackend | None = None,
+    ):
+        self.session_maker = session_maker
+        self.fallback = fallback
+
+    async def search(self, filters: dict, page: int, page_size: int) -> dict:
+        if any(filters.get(name) for name in self.UNSUPPORTED_FILTERS):
+            return await self._fallback(filters, page, page_size)
+
+        conditions = []
+        rank = None
+
+        tsquery = self._build_tsquery(filters)
+        if tsquery:
+            query = func.to_tsquery("simple", tsquery)
+            conditions.append(BookModel.search_vector.op("@@")(query))
+            rank = func.ts_rank_cd(BookModel.search_vector, query)
+
+        if filters.get("year"):
+            conditions.append(BookModel.published_year == filters["year"])
+
+        if not conditions:
+            return {"items": [], "total": 0}
+
+        offset = (page - 1) * page_size
+        order_by = [rank.desc(), BookModel.id] if rank is not None else [BookModel.id]
+
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(
+                    BookModel.work_olid,
+                    BookModel.title,
+                    BookModel.published_year,
+                    BookModel.cover_url,
+                    func.count().over().label("total"),
+                )
+                .where(*conditions)
+                .order_by(*order_by)
+                .limit(page_size)
+                .offset(offset)
+            )
+            rows = result.all()
+
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Page past the end: the window count is not available
+                total = await session.scalar(
+                    select(func.count()).select_from(BookModel).where(*conditions)
+                )
+            else:
+                total = 0
+
+            authors = await get_book_authors(session, [row.work_olid for row in rows])
+
+        if total == 0:
+            return await self._fallback(filters, page, page_size)
+
+        items = [
+            {
+                "work_olid": row.work_olid,
+                "title": row.title,
+                "authors": authors.get(row.work_olid),
+                "year": row.published_year,
+                "cover_url": row.cover_url,
+            }
+            for row in rows
+        ]
+
+        return {"items": items, "total": total}
+
+    def _build_tsquery(self, filters: dict) -> str | None:
+        """
+        Builds a tsquery where every word is a prefix restricted to its column weight
+        """
+
+        terms = []
+        for name, weight in self.FIELD_WEIGHTS.items():
+            value = filters.get(name)
+            if not value:
+                continue
+            for word in WORD_RE.findall(value.casefold()):
+                terms.append(f"{word}:*{weight}")
+
+        return " & ".join(terms) or None
+
+    async def _fallback(self, filters: dict, page: int, page_size: int) -> dict:
+        if self.fallback is None:
+            return {"items": [], "total": 0}
+        return await self.fallback.search(filters, page, page_size)
+
+
+def create_search_backend(
+        name: str,
+        service: OpenLibraryService,
+        session_maker: async_sessionmaker[AsyncSession],
+) -> SearchBackend:
+    """
+    Creates the configured search backend ("open_library" or "local")
+    """
+
+    open_library = OpenLibrarySearchBackend(service)
+
+    if name == LocalSearchBackend.name:
+        return LocalSearchBackend(session_maker, fallback=open_library)
+    if name == OpenLibrarySearchBackend.name:
+        return open_library
+
+    raise ValueError(f"Unknown search backend: {name}")
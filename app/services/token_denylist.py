@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import AUTH_DENYLIST_REFRESH_INTERVAL
+from app.models.token_revocations import TokenRevocation
+
+
+logger = logging.getLogger(__name__)
+
+# Token version recorded for deleted users: no token is accepted any more
+DELETED_USER_VERSION = 2 ** 31 - 1
+
+
+async def revoke_user_tokens(db: AsyncSession, user_id: int, token_version: int) -> None:
+    """
+    Records that tokens of a user below `token_version` are no longer accepted.
+    Runs in the caller's transaction.
+    """
+
+    stmt = insert(TokenRevocation).values(user_id=user_id, token_version=token_version)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TokenRevocation.user_id],
+            set_={"token_version": stmt.excluded.token_version, "revoked_at": func.now()},
+        )
+    )
+
+
+class TokenDenylist:
+    """
+    In-memory copy of recent token revocations, used to authenticate from token claims alone.
+
+    - Maps user id to the lowest accepted token version
+    - Only revocations younger than `window` (the access token lifetime) are loaded;
+      tokens issued before older revocations have expired anyway
+    - Reloaded every `refresh_interval` seconds, so revocations made by other app processes
+      take effect within that interval; revocations made here take effect immediately
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            window: float,
+            refresh_interval: float = AUTH_DENYLIST_REFRESH_INTERVAL,
+    ):
+        self.session_maker = session_maker
+        self.window = window
+        self.refresh_interval = refresh_interval
+        self._versions: dict[int, int] = {}
+        # Local revocations made while a refresh is running, which it may not have seen
+        self._pending: dict[int, int] = {}
+        self._refresher: asyncio.Task | None = None
+
+        self.refreshes = 0
+        self.rejected = 0
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        if token_version < self._versions.get(user_id, 0):
+            self.rejected += 1
+            return True
+        return False
+
+    def revoke(self, user_id: int, token_version: int) -> None:
+        """
+        Applies a committed revocation locally without waiting for the next refresh
+        """
+
+        for versions in (self._versions, self._pending):
+            versions[user_id] = max(versions.get(user_id, 0), token_version)
+
+    async def refresh(self) -> None:
+        cutoff = func.now() - timedelta(seconds=self.window)
+        self._pending = {}
+
+        async with self.session_maker() as db:
+            # Revocations past the window are no longer needed by any process
+            await db.execute(delete(TokenRevocation).where(TokenRevocation.revoked_at < cutoff))
+            result = await db.execute(
+                select(TokenRevocation.user_id, TokenRevocation.token_version)
+                .where(TokenRevocation.revoked_at >= cutoff)
+            )
+            versions = dict(result.tuples().all())
+            await db.commit()
+
+        for user_id, token_version in self._pending.items():
+            versions[user_id] = max(versions.get(user_id, 0), token_version)
+        self._versions = versions
+        self.refreshes += 1
+
+    async def start(self) -> None:
+        """
+        Loads the denylist and keeps it refreshed in the background
+        """
+
+        await self.refresh()
+        self._refresher = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except (OSError, SQLAlchemyError):
+                # Keep the last loaded revocations until the database is reachable again
+                logger.warning("Token denylist refresh failed", exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._versions),
+            "window": self.window,
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+
+import asyncpg
+from sqlalchemy import inspect, select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import USER_CACHE_TTL, USER_CACHE_MAX_ENTRIES
+from app.models.users import User as UserModel
+from app.services.cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL channel carrying the subjects (emails) of changed users to every app process
+INVALIDATION_CHANNEL = "user_cache_invalidate"
+
+# Delay before reconnecting a lost invalidation listener
+RECONNECT_DELAY = 5
+
+
+async def publish_user_change(db: AsyncSession, email: str) -> None:
+    """
+    Tells every app process to drop the cached principal.
+    Runs in the caller's transaction: NOTIFY is only delivered on commit.
+    """
+
+    await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, email)))
+
+
+class UserCache:
+    """
+    Bounded TTL cache of authenticated user principals keyed by token subject.
+
+    - Stores column values, and every hit gets its own detached User instance
+    - Changed users are dropped locally by `invalidate` and in other processes through
+      LISTEN/NOTIFY (`publish_user_change`)
+    - If the listener connection is lost the cache is cleared, so missed notifications
+      cannot keep stale principals around
+    """
+
+    def __init__(self, dsn: str | None = None, ttl: float = USER_CACHE_TTL, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.dsn = dsn
+        self.ttl = ttl
+        self._entries = LRUCache(max_entries)
+        # Bumped on every invalidation; loads that started before it are not cached
+        self._generation = 0
+        self._listener: asyncio.Task | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, subject: str) -> UserModel | None:
+        if self.ttl <= 0:
+            return None
+
+        values = self._entries.get(subject)
+        if values is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        user = UserModel(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, subject: str, user: UserModel, generation: int) -> None:
+        """
+        Caches a user loaded from the database, unless it was invalidated since `generation`
+        """
+
+        if self.ttl <= 0 or generation != self._generation:
+            return
+
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(UserModel).column_attrs}
+        self._entries.set(subject, values, self.ttl)
+
+    def invalidate(self, subject: str) -> None:
+        self._generation += 1
+        self.invalidations += 1
+        self._entries.delete(subject)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries = LRUCache(self._entries.max_entries)
+
+    def start(self) -> None:
+        """
+        Starts listening for invalidations from other app processes
+        """
+
+        if self.dsn and self.ttl > 0:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        # asyncpg takes a plain postgresql:// DSN
+        dsn = make_url(self.dsn).set(drivername="postgresql").render_as_string(hide_password=False)
+
+        while True:
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError):
+                logger.warning("User cache invalidation listener could not connect", exc_info=True)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            try:
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(
+                    INVALIDATION_CHANNEL,
+                    lambda connection, pid, channel, payload: self.invalidate(payload),
+                )
+                # Anything cached before listening could have missed a notification
+                self.clear()
+                await lost.wait()
+                logger.warning("User cache invalidation listener disconnected")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+            self.clear()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "listening": self._listener is not None and not self._listener.done(),
+        }
@@ -1,21 +1,83 @@
 from contextlib import asynccontextmanager
 
-import httpx
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
-from app.routers import auth, users, books, reviews, favorites, bookshelves, user_books
-from app.services.open_library import OpenLibraryService
+from app.config import (
+    OPEN_LIBRARY_BASE_URL,
+    OPEN_LIBRARY_CACHE_MAX_ENTRIES,
+    OPEN_LIBRARY_CACHE_PERSISTENT,
+    OPEN_LIBRARY_CACHE_TTL,
+    OPEN_LIBRARY_CACHE_STALE_TTL,
+    OPEN_LIBRARY_BREAKER_RESET_TIMEOUT,
+    OPEN_LIBRARY_LOCAL_FIRST,
+    SEARCH_BACKEND,
+    AUTH_STATELESS,
+)
+from app.auth import password_hasher, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.database import DATABASE_URL, async_session_maker
+from app.routers import auth, users, books, reviews, favorites, bookshelves, user_books, admin, covers
+from app.services.authors import AuthorStore
+from app.services.cache import MetadataCache, DatabaseCacheStore
+from app.services.catalog_mirror import CatalogMirror
+from app.services.covers import CoverCache
+from app.services.enrichment import EnrichmentQueue
+from app.services.http_client import create_http_client
+from app.services.search import create_search_backend
+from app.services.open_library import OpenLibraryService, OpenLibraryUnavailable, stale_keys
+from app.services.user_cache import UserCache
+from app.services.token_denylist import TokenDenylist
+from app.services.refresh_tokens import RefreshTokenSweeper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    http_client = httpx.AsyncClient(base_url="https://openlibrary.org")
-    app.state.open_library_service = OpenLibraryService(http_client)
+    http_client, app.state.http_transport = create_http_client(OPEN_LIBRARY_BASE_URL)
+    app.state.http_client = http_client
+    cache = MetadataCache(
+        ttls=OPEN_LIBRARY_CACHE_TTL,
+        max_entries=OPEN_LIBRARY_CACHE_MAX_ENTRIES,
+        store=(
+            DatabaseCacheStore(async_session_maker, stale_ttl=OPEN_LIBRARY_CACHE_STALE_TTL)
+            if OPEN_LIBRARY_CACHE_PERSISTENT else None
+        ),
+        stale_ttl=OPEN_LIBRARY_CACHE_STALE_TTL,
+    )
+    mirror = CatalogMirror(async_session_maker) if OPEN_LIBRARY_LOCAL_FIRST else None
+    app.state.open_library_service = OpenLibraryService(
+        http_client,
+        cache=cache,
+        mirror=mirror,
+        authors=AuthorStore(async_session_maker),
+    )
+    app.state.search_backend = create_search_backend(
+        SEARCH_BACKEND,
+        app.state.open_library_service,
+        async_session_maker,
+    )
+    app.state.enrichment_queue = EnrichmentQueue(async_session_maker, app.state.open_library_service)
+    app.state.enrichment_queue.start()
+    app.state.cover_cache = CoverCache(http_client)
+    app.state.user_cache = UserCache(DATABASE_URL)
+    app.state.user_cache.start()
+    app.state.token_denylist = TokenDenylist(async_session_maker, window=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    if AUTH_STATELESS:
+        await app.state.token_denylist.start()
+    app.state.refresh_token_sweeper = RefreshTokenSweeper(async_session_maker)
+    app.state.refresh_token_sweeper.start()
     yield  # here FastAPI handles requests
     # shutdown
-    await app.state.open_library_service.client.aclose()
+    await app.state.enrichment_queue.close()
+    await app.state.open_library_service.close()
+    await http_client.aclose()
+    await cache.close()
+    app.state.cover_cache.close()
+    await app.state.user_cache.close()
+    await app.state.token_denylist.close()
+    await app.state.refresh_token_sweeper.close()
+    password_hasher.close()
 
 
 # Connecting lifespan to FastAPI
@@ -27,6 +89,34 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def mark_stale_responses(request: Request, call_next):
+    """
+    Flags responses that contain stale Open Library data
+    """
+    served_stale = set()
+    token = stale_keys.set(served_stale)
+    try:
+        response = await call_next(request)
+    finally:
+        stale_keys.reset(token)
+
+    if served_stale:
+        response.headers["Warning"] = '110 - "Response is Stale"'
+        response.headers["X-Data-Stale"] = "true"
+
+    return response
+
+
+@app.exception_handler(OpenLibraryUnavailable)
+async def open_library_unavailable_handler(request: Request, exc: OpenLibraryUnavailable):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Open Library is temporarily unavailable"},
+        headers={"Retry-After": str(int(OPEN_LIBRARY_BREAKER_RESET_TIMEOUT))},
+    )
+
+
 # connecting routers
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -35,6 +125,8 @@ app.include_router(reviews.router)
 app.include_router(favorites.router)
 app.include_router(bookshelves.router)
 app.include_router(user_books.router)
+app.include_router(admin.router)
+app.include_router(covers.router)
 
 
 # root endpoint
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_engine
+from app.models.books import Book as BookModel
+from app.models.user_books import UserBook as UserBookModel, ReadingStatus
+from app.models.users import User as UserModel
+from app.schemas.user_books import UserBook as UserBookSchema
+
+
+# Reading list page as loaded by get_user_books before and after the read-only query path
+def orm_query(user_id: int, page_size: int):
+    return (
+        select(UserBookModel, BookModel)
+        .outerjoin(BookModel, BookModel.work_olid == UserBookModel.work_olid)
+        .where(UserBookModel.user_id == user_id)
+        .order_by(UserBookModel.created_at.desc(), UserBookModel.id.desc())
+        .limit(page_size)
+    )
+
+
+def core_query(user_id: int, page_size: int):
+    return (
+        select(
+            UserBookModel.id,
+            UserBookModel.work_olid,
+            UserBookModel.status,
+            UserBookModel.progress_percent,
+            UserBookModel.rating,
+            UserBookModel.started_at,
+            UserBookModel.finished_at,
+            UserBookModel.created_at,
+            UserBookModel.updated_at,
+            BookModel.title,
+            BookModel.cover_url,
+            BookModel.published_year,
+        )
+        .outerjoin(BookModel, BookModel.work_olid == UserBookModel.work_olid)
+        .where(UserBookModel.user_id == user_id)
+        .order_by(UserBookModel.created_at.desc(), UserBookModel.id.desc())
+        .limit(page_size)
+    )
+
+
+async def load_orm(session: AsyncSession, user_id: int, page_size: int) -> list:
+    result = await session.execute(orm_query(user_id, page_size))
+    items = [
+        UserBookSchema(
+            id=user_book.id,
+            work_olid=user_book.work_olid,
+            status=user_book.status.value,
+            progress_percent=user_book.progress_percent,
+            rating=user_book.rating,
+            started_at=user_book.started_at,
+            finished_at=user_book.finished_at,
+            created_at=user_book.created_at,
+            updated_at=user_book.updated_at,
+            title=book.title if book else None,
+            authors=[],
+            cover_url=book.cover_url if book else None,
+            published_year=book.published_year if book else None,
+        )
+        for user_book, book in result.all()
+    ]
+    # A request-scoped session is discarded after every request
+    session.expunge_all()
+    return items
+
+
+async def load_core(session: AsyncSession, user_id: int, page_size: int) -> list:
+    result = await session.execute(core_query(user_id, page_size))
+    return [UserBookSchema(**row._mapping, authors=[]) for row in result.all()]
+
+
+async def measure(loader, session: AsyncSession, user_id: int, page_size: int, iterations: int) -> dict:
+    # Warm up statement caches
+    for _ in range(10):
+        await loader(session, user_id, page_size)
+
+    started = time.process_time()
+    for _ in range(iterations):
+        await loader(session, user_id, page_size)
+    cpu = time.process_time() - started
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 50)):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await loader(session, user_id, page_size)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    rows = iterations * page_size
+    return {
+        "cpu_us_per_row": cpu / rows * 1_000_000,
+        "peak_kib_per_page": sum(peaks) / len(peaks) / 1024,
+    }
+
+
+async def run(page_size: int, iterations: int) -> None:
+    # SQL echo would dominate the measurement
+    async_engine.sync_engine.echo = False
+
+    async with async_engine.connect() as conn:
+        # Fixture rows live in one transaction that is rolled back at the end
+        transaction = await conn.begin()
+        try:
+            suffix = uuid.uuid4().hex[:12]
+            user_id = (await conn.execute(
+                insert(UserModel)
+                .values(email=f"bench-{suffix}@example.com", username="bench", hashed_password="-", role="user")
+                .returning(UserModel.id)
+            )).scalar_one()
+
+            work_olids = [f"OL{suffix}{i}W" for i in range(page_size)]
+            await conn.execute(insert(BookModel), [
+                {"work_olid": work_olid, "title": f"Benchmark book {i}", "authors": "Bench Author",
+                 "cover_url": f"https://covers.openlibrary.org/b/id/{i}-L.jpg", "published_year": 2000}
+                for i, work_olid in enumerate(work_olids)
+            ])
+            await conn.execute(insert(UserBookModel), [
+                {"user_id": user_id, "work_olid": work_olid, "status": ReadingStatus.READING, "progress_percent": 10}
+                for work_olid in work_olids
+            ])
+
+            session = AsyncSession(bind=conn, autoflush=False)
+            results = {
+                "orm": await measure(load_orm, session, user_id, page_size, iterations),
+                "core": await measure(load_core, session, user_id, page_size, iterations),
+            }
+            await session.close()
+        finally:
+            await transaction.rollback()
+
+    print(f"{page_size}-item pages, {iterations} iterations")
+    print(f"{'path':<6}{'CPU us/row':>14}{'peak KiB/page':>16}")
+    for name, result in results.items():
+        print(f"{name:<6}{result['cpu_us_per_row']:>14.1f}{result['peak_kib_per_page']:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares ORM hydration with plain Core rows for the reading list page"
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.page_size, args.iterations))
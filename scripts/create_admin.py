@@ -28,7 +28,7 @@ async def create_admin():
         admin = User(
             email=ADMIN_EMAIL,
             username=ADMIN_USERNAME,
-            hashed_password=hash_password(ADMIN_PASSWORD),
+            hashed_password=await hash_password(ADMIN_PASSWORD),
             role="admin",
             is_active=True
         )
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+
+# Recorded corpus layout:
+#   works/OL45804W.json, books/OL7353617M.json, authors/OL23919A.json  - API responses
+#   search/<sha1 of the query string>.json                             - {"params": ..., "body": ...}
+DEFAULT_CORPUS = "fixtures/open_library"
+
+COLLECTIONS = ("works", "books", "authors")
+
+OLID_RE = re.compile(r"^OL\d+[WMA]$")
+
+# Batched work lookups made by OpenLibraryService.get_books_by_works
+KEY_QUERY_RE = re.compile(r"^key:\((.+)\)$")
+
+USER_AGENT = "LibraryHub-Recorder/0.1 (offline benchmark corpus)"
+
+
+def search_id(params: dict) -> str:
+    """
+    Stable file name for a search request
+    """
+
+    query = urlencode(sorted(params.items()))
+    return hashlib.sha1(query.encode()).hexdigest()
+
+
+class Corpus:
+    """
+    Recorded Open Library responses stored as JSON files
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        for collection in (*COLLECTIONS, "search"):
+            (self.root / collection).mkdir(parents=True, exist_ok=True)
+
+    def get(self, collection: str, olid: str) -> dict | None:
+        path = self.root / collection / f"{olid}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def put(self, collection: str, olid: str, body: dict) -> None:
+        path = self.root / collection / f"{olid}.json"
+        path.write_text(json.dumps(body, ensure_ascii=False), encoding="utf-8")
+
+    def get_search(self, params: dict) -> dict | None:
+        record = self.get("search", search_id(params))
+        return record["body"] if record else None
+
+    def put_search(self, params: dict, body: dict) -> None:
+        self.put("search", search_id(params), {"params": params, "body": body})
+
+    def work_doc(self, olid: str) -> dict | None:
+        """
+        Builds a search.json document for a recorded work
+        """
+
+        work = self.get("works", olid)
+        if work is None:
+            return None
+
+        author_keys = [
+            a.get("author", {}).get("key", "").split("/")[-1]
+            for a in work.get("authors", [])
+            if a.get("author", {}).get("key")
+        ]
+        authors = [self.get("authors", key) for key in author_keys]
+
+        year = None
+        match = re.search(r"\d{4}", work.get("first_publish_date") or "")
+        if match:
+            year = int(match.group())
+
+        covers = work.get("covers") or []
+
+        return {
+            "key": f"/works/{olid}",
+            "title": work.get("title"),
+            "author_key": [key for key, author in zip(author_keys, authors) if author],
+            "author_name": [author.get("name") for author in authors if author],
+            "first_publish_year": year,
+            "cover_i": covers[0] if covers else None,
+            "subject": work.get("subjects") or [],
+        }
+
+
+def parse_latency(spec: str) -> tuple[str, list[float]]:
+    """
+    Parses a latency distribution like "lognormal:80:0.6" (values in milliseconds)
+    """
+
+    name, *args = spec.split(":")
+    expected = {"none": 0, "constant": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    try:
+        if name not in expected or len(args) != expected[name]:
+            raise ValueError
+        return name, [float(arg) for arg in args]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected none, constant:MS, uniform:MIN:MAX, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA"
+        )
+
+
+class Faults:
+    """
+    Latency distribution, error rate and timeouts injected into every response
+    """
+
+    def __init__(
+            self,
+            latency: tuple[str, list[float]],
+            error_rate: float,
+            error_status: int,
+            timeout_rate: float,
+            timeout_seconds: float,
+            seed: int | None,
+    ):
+        self.random = random.Random(seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+
+    def delay(self) -> float:
+        """
+        Samples one response delay in seconds
+        """
+
+        name, args = self.latency
+        if name == "constant":
+            ms = args[0]
+        elif name == "uniform":
+            ms = self.random.uniform(*args)
+        elif name == "normal":
+            ms = self.random.gauss(*args)
+        elif name == "lognormal":
+            # Median in ms and sigma of the underlying normal distribution (long right tail)
+            median, sigma = args
+            ms = median * self.random.lognormvariate(0, sigma)
+        else:
+            ms = 0
+        return max(ms, 0) / 1000
+
+    async def apply(self) -> Response | None:
+        """
+        Waits for the sampled latency and returns an error response if one was drawn
+        """
+
+        if self.random.random() < self.timeout_rate:
+            # Hang longer than any sane client timeout
+            await asyncio.sleep(self.timeout_seconds)
+            return JSONResponse({"error": "timeout"}, status_code=504)
+
+        await asyncio.sleep(self.delay())
+
+        if self.random.random() < self.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=self.error_status)
+
+        return None
+
+
+def create_app(corpus: Corpus, faults: Faults | None = None, upstream: str | None = None) -> FastAPI:
+    """
+    Serves the corpus; with `upstream` set, forwards every request and records the response instead
+    """
+
+    client = httpx.AsyncClient(
+        base_url=upstream,
+        timeout=30,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) if upstream else None
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        if client is not None:
+            await client.aclose()
+
+    app = FastAPI(title="Fake Open Library", lifespan=lifespan)
+
+    stats = {"served": 0, "missing": 0, "injected": 0, "recorded": 0}
+
+    if faults is not None:
+        @app.middleware("http")
+        async def inject_faults(request: Request, call_next):
+            if request.url.path == "/_stats":
+                return await call_next(request)
+            response = await faults.apply()
+            if response is not None:
+                stats["injected"] += 1
+                return response
+            return await call_next(request)
+
+    async def forward(path: str, params: dict) -> tuple[int, dict | None]:
+        try:
+            response = await client.get(path, params=params)
+        except httpx.HTTPError:
+            return 502, None
+        if response.status_code != 200:
+            return response.status_code, None
+        stats["recorded"] += 1
+        return 200, response.json()
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    @app.get("/search.json")
+    async def search(request: Request):
+        params = dict(request.query_params)
+
+        if client is not None:
+            status_code, body = await forward("/search.json", params)
+            if body is None:
+                return JSONResponse({"error": "upstream error"}, status_code=status_code)
+            corpus.put_search(params, body)
+            return body
+
+        body = corpus.get_search(params)
+        if body is None:
+            # Batched key:(...) lookups are answered from recorded works
+            match = KEY_QUERY_RE.match(params.get("q", ""))
+            if match:
+                olids = [key.split("/")[-1] for key in match.group(1).split(" OR ")]
+                docs = [doc for doc in map(corpus.work_doc, olids) if doc]
+                body = {"numFound": len(docs), "start": 0, "docs": docs}
+            else:
+                stats["missing"] += 1
+                body = {"numFound": 0, "start": 0, "docs": []}
+
+        stats["served"] += 1
+        return body
+
+    @app.get("/{collection}/{olid}.json")
+    async def get_record(collection: str, olid: str):
+        if collection not in COLLECTIONS or not OLID_RE.match(olid):
+            return JSONResponse({"error": "notfound"}, status_code=404)
+
+        if client is not None:
+            status_code, body = await forward(f"/{collection}/{olid}.json", {})
+            if body is None:
+                return JSONResponse({"error": "upstream error"}, status_code=status_code)
+            corpus.put(collection, olid, body)
+            return body
+
+        body = corpus.get(collection, olid)
+        if body is None:
+            stats["missing"] += 1
+            return JSONResponse({"error": "notfound", "key": f"/{collection}/{olid}"}, status_code=404)
+
+        stats["served"] += 1
+        return body
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for openlibrary.org serving a recorded corpus, or recording one"
+    )
+    parser.add_argument("mode", choices=["serve", "record"], help="serve the corpus, or proxy and record real traffic")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help=f"Corpus directory (default {DEFAULT_CORPUS})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--upstream", default="https://openlibrary.org", help="Recorded server (record mode)")
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        default="none",
+        help="none, constant:MS, uniform:MIN:MAX, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA (serve mode)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of requests that hang")
+    parser.add_argument("--timeout-seconds", type=float, default=60.0, help="How long hanging requests hang")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    corpus = Corpus(args.corpus)
+    if args.mode == "record":
+        app = create_app(corpus, upstream=args.upstream)
+    else:
+        faults = Faults(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            timeout_rate=args.timeout_rate,
+            timeout_seconds=args.timeout_seconds,
+            seed=args.seed,
+        )
+        app = create_app(corpus, faults=faults)
+
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,188 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from app.database import async_engine
+
+
+# Dump record type -> mirror table
+TABLES = {
+    "/type/work": "catalog_works",
+    "/type/edition": "catalog_editions",
+    "/type/author": "catalog_authors",
+}
+
+COLUMNS = ["key", "revision", "last_modified", "data"]
+
+# Import settings
+BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+WORKERS = int(os.getenv("IMPORT_WORKERS", str(os.cpu_count() or 2)))
+
+
+def parse_timestamp(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def strip_nul(value):
+    """
+    Removes NUL characters from every string in a parsed JSON value
+    """
+
+    if isinstance(value, str):
+        return value.replace("\0", "")
+    if isinstance(value, list):
+        return [strip_nul(item) for item in value]
+    if isinstance(value, dict):
+        return {strip_nul(key): strip_nul(item) for key, item in value.items()}
+    return value
+
+
+def parse_lines(lines: list[str], since: dict[str, datetime]) -> dict[str, list[tuple]]:
+    """
+    Parses dump lines into rows grouped by mirror table.
+    Runs in a worker process.
+    """
+
+    rows: dict[str, list[tuple]] = {table: [] for table in TABLES.values()}
+
+    for line in lines:
+        # type, key, revision, last_modified, JSON record
+        parts = line.rstrip("\n").split("\t", 4)
+        if len(parts) != 5:
+            continue
+
+        record_type, key, revision, last_modified, data = parts
+        table = TABLES.get(record_type)
+        if table is None:
+            continue
+
+        modified = parse_timestamp(last_modified)
+        # Records modified at the cutoff may not all have been imported, the merge skips older revisions
+        if table in since and modified is not None and modified < since[table]:
+            continue
+
+        try:
+            record = json.loads(data)
+        except ValueError:
+            continue
+        if "\\u0000" in data:
+            # PostgreSQL jsonb does not accept NUL characters
+            data = json.dumps(strip_nul(record))
+
+        rows[table].append((key.split("/")[-1], int(revision), modified, data))
+
+    return rows
+
+
+async def load_rows(conn, table: str, rows: list[tuple]) -> None:
+    """
+    Loads rows with COPY into a staging table and merges them into the mirror table.
+    Existing records are only replaced by newer revisions.
+    """
+
+    staging = f"{table}_staging"
+
+    async with conn.transaction():
+        await conn.copy_records_to_table(staging, records=rows, columns=COLUMNS)
+        await conn.execute(f"""
+            INSERT INTO {table} (key, revision, last_modified, data)
+            SELECT DISTINCT ON (key) key, revision, last_modified, data
+            FROM {staging}
+            ORDER BY key, revision DESC
+            ON CONFLICT (key) DO UPDATE
+            SET revision = EXCLUDED.revision,
+                last_modified = EXCLUDED.last_modified,
+                data = EXCLUDED.data
+            WHERE {table}.revision < EXCLUDED.revision
+        """)
+        await conn.execute(f"TRUNCATE {staging}")
+
+
+def read_batches(path: str):
+    """
+    Streams the gzip dump file in batches of lines
+    """
+
+    with gzip.open(path, "rt", encoding="utf-8") as dump:
+        batch = []
+        for line in dump:
+            batch.append(line)
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+async def import_dump(paths: list[str], incremental: bool):
+    async with async_engine.connect() as sa_conn:
+        raw = await sa_conn.get_raw_connection()
+        conn = raw.driver_connection
+
+        for table in TABLES.values():
+            await conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {table}_staging (LIKE {table} INCLUDING DEFAULTS)"
+            )
+
+        # Incremental import: skip records not modified since the previous import
+        since: dict[str, datetime] = {}
+        if incremental:
+            for table in TABLES.values():
+                latest = await conn.fetchval(f"SELECT max(last_modified) FROM {table}")
+                if latest is not None:
+                    since[table] = latest
+
+        loop = asyncio.get_running_loop()
+        imported = {table: 0 for table in TABLES.values()}
+
+        with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+            for path in paths:
+                print(f"Importing {path}")
+
+                # Bounded number of parsed batches in flight keeps memory flat
+                pending = deque()
+
+                async def flush_oldest():
+                    parsed = await pending.popleft()
+                    for table, rows in parsed.items():
+                        if rows:
+                            await load_rows(conn, table, rows)
+                            imported[table] += len(rows)
+
+                for batch in read_batches(path):
+                    pending.append(loop.run_in_executor(pool, parse_lines, batch, since))
+                    if len(pending) >= WORKERS * 2:
+                        await flush_oldest()
+                        print(f"  {imported}")
+
+                while pending:
+                    await flush_oldest()
+
+        for table in TABLES.values():
+            await conn.execute(f"ANALYZE {table}")
+
+    await async_engine.dispose()
+    print(f"Import finished: {imported}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import Open Library bulk dumps (works/editions/authors) into the local catalog mirror"
+    )
+    parser.add_argument("paths", nargs="+", help="Dump files, e.g. ol_dump_works_latest.txt.gz")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip records not modified since the newest record already imported",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(import_dump(args.paths, args.incremental))
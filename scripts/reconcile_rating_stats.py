@@ -0,0 +1,15 @@
+import asyncio
+
+from app.database import async_session_maker
+from app.services.ratings import reconcile_rating_stats
+
+
+async def reconcile():
+    async with async_session_maker() as session:
+        result = await reconcile_rating_stats(session)
+
+    print(f"Rating stats reconciled: {result['fixed']} fixed, {result['removed']} removed")
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile())